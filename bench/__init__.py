@@ -0,0 +1 @@
+"""Бенчмарки дашборда вне Streamlit."""
@@ -0,0 +1,163 @@
+"""Генератор синтетических данных в схемах файлов output/.
+
+Пишет те же семейства файлов, что и выгрузка: ежедневные очки, оценки
+навыков, задания (полная и расширенная выгрузки) и календарь больничных
+и отпусков. Очки за день равны сумме очков заданий, а очки задания -
+skill_points_rating * capped_share, как в реальных данных.
+
+    python -m bench.generate --employees 10000 --years 5 --tasks-per-day 3 --output-dir /tmp/synthetic
+"""
+
+import argparse
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+AREAS = [
+    'Сборки', 'Тестирования', 'Корпусирования', 'Программирования', 'Упаковки',
+    'Конвейерной сборки', 'Контрактное Производство', 'Корпусирования Брелоков',
+]
+SKILL_POINTS = np.array([1.0, 3.0, 9.0, 18.0, 27.0, 54.0])
+
+FULL_TASK_COLUMNS = [
+    'id_employee', 'fio_employee', 'date', 'area', 'sap_id', 'sap_name', 'units_made',
+    'norma_product_adjusted_with_discounts', 'is_norma', 'has_both_types', 'sum_norma_ok_share',
+    'non_norma_count', 'share_of_done', 'share_of_done2', 'skill_points_rating', 'capped_share', 'points',
+]
+TASK_COLUMNS = [
+    'sap_id', 'date', 'id_employee', 'fio_employee', 'working_hours', 'area', 'sap_name', 'units_made',
+    'norma_product_adjusted_with_discounts', 'labor_costs_per_task', 'skill_points', 'is_norma',
+    'share_of_done', 'has_both_types', 'sum_norma_ok_share', 'non_norma_count', 'share_of_done2',
+    'sap_product', 'skill_points_rating', 'capped_share', 'points',
+]
+
+
+def make_products(rng, count):
+    """Справочник изделий: sap_id, sap_name, area."""
+    sap_ids = rng.choice(np.arange(3_100_000, 10_600_000), size=count, replace=False)
+    return pd.DataFrame({
+        'sap_id': sap_ids,
+        'sap_name': [f'Изделие {sap_id}' for sap_id in sap_ids],
+        'area': rng.choice(AREAS, size=count),
+    })
+
+
+def month_tasks(rng, employees, products, year, month, tasks_per_day, work_share):
+    """Задания всех сотрудников за месяц в схеме полной выгрузки."""
+    days = pd.date_range(f'{year}-{month:02d}-01', periods=pd.Period(f'{year}-{month:02d}').days_in_month)
+    worked = rng.random((len(employees), len(days))) < work_share
+    employee_pos, day_pos = np.nonzero(worked)
+
+    # Число заданий в рабочий день: не меньше одного
+    counts = np.maximum(rng.poisson(tasks_per_day, size=len(employee_pos)), 1)
+    employee_pos = np.repeat(employee_pos, counts)
+    day_pos = np.repeat(day_pos, counts)
+    n = len(employee_pos)
+
+    product_pos = rng.integers(0, len(products), size=n)
+    norma = np.round(rng.uniform(10, 500, size=n), 2)
+    units_made = np.round(norma * rng.uniform(0.2, 1.3, size=n))
+    share_of_done = units_made / norma
+    capped_share = np.where(rng.random(n) < 0.4, 1.0, np.minimum(share_of_done, 1.0))
+    rating = rng.choice(SKILL_POINTS, size=n)
+
+    return pd.DataFrame({
+        'id_employee': employees['id_employee'].to_numpy()[employee_pos],
+        'fio_employee': employees['fio_employee'].to_numpy()[employee_pos],
+        'date': days[day_pos].strftime('%Y-%m-%d'),
+        'area': products['area'].to_numpy()[product_pos],
+        'sap_id': products['sap_id'].to_numpy()[product_pos],
+        'sap_name': products['sap_name'].to_numpy()[product_pos],
+        'units_made': units_made,
+        'norma_product_adjusted_with_discounts': norma,
+        'is_norma': share_of_done >= 1.0,
+        'has_both_types': rng.random(n) < 0.1,
+        'sum_norma_ok_share': share_of_done,
+        'non_norma_count': rng.integers(0, 5, size=n),
+        'share_of_done': share_of_done,
+        'share_of_done2': share_of_done,
+        'skill_points_rating': rating,
+        'capped_share': capped_share,
+        'points': rating * capped_share,
+    })
+
+
+def generate(output_dir, employees=250, years=1, tasks_per_day=2.0, start_year=2025, work_share=0.7, seed=0):
+    """Записывает синтетические данные в output_dir и возвращает число строк по семействам."""
+    rng = np.random.default_rng(seed)
+    output_dir = Path(output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+
+    ids = np.sort(rng.choice(np.arange(10_000, 10_000 + employees * 10), size=employees, replace=False))
+    staff = pd.DataFrame({'id_employee': ids, 'fio_employee': [f'Сотрудник {i}' for i in ids]})
+    products = make_products(rng, max(50, employees // 5))
+
+    rows = {'employee_points_daily': 0, 'skills_mark': 0, 'tasks_full': 0, 'tasks': 0, 'calendar_sick_holidays': 0}
+    calendar = []
+    for year in range(start_year, start_year + years):
+        for month in range(1, 13):
+            suffix = f'{year}_{month:02d}'
+            tasks = month_tasks(rng, staff, products, year, month, tasks_per_day, work_share)
+            tasks[FULL_TASK_COLUMNS].to_csv(
+                output_dir / f'employee_daily_tasks_points_full_{suffix}.csv', index=False, encoding='utf-8-sig'
+            )
+
+            # Расширенная выгрузка: те же строки с дополнительными колонками
+            extended = tasks.assign(
+                working_hours=np.round(rng.uniform(4, 12, size=len(tasks))),
+                labor_costs_per_task=np.round(rng.uniform(0, 90_000, size=len(tasks))),
+                skill_points=tasks['skill_points_rating'],
+                sap_product=tasks['sap_id'].astype(float),
+            )
+            extended[TASK_COLUMNS].to_csv(
+                output_dir / f'employee_daily_tasks_points_{suffix}.csv', index=False, encoding='utf-8-sig'
+            )
+
+            daily = tasks.groupby(['id_employee', 'date'], as_index=False)['points'].sum()
+            daily.to_csv(output_dir / f'employee_points_daily_{suffix}.csv', index=False, encoding='utf-8-sig')
+
+            skills_mark = staff.assign(year=year, month=month, skills_mark=rng.integers(1, 26, size=employees))
+            skills_mark[['year', 'month', 'id_employee', 'fio_employee', 'skills_mark']].to_csv(
+                output_dir / f'rating_linear_col9_{suffix}.csv', index=False, encoding='utf-8-sig'
+            )
+
+            calendar.append(pd.DataFrame({
+                'year': year,
+                'month': month,
+                'id_employee': ids,
+                'sick_count': rng.choice([0.0, 0.0, 0.0, 1.0, 3.0, 5.0], size=employees),
+                'holidays_count': rng.choice([0.0, 0.0, 2.0, 4.0, 14.0], size=employees),
+            }))
+
+            rows['tasks_full'] += len(tasks)
+            rows['tasks'] += len(tasks)
+            rows['employee_points_daily'] += len(daily)
+            rows['skills_mark'] += employees
+
+    calendar = pd.concat(calendar, ignore_index=True)
+    calendar.to_csv(output_dir / 'calendar_sick_holidays.csv', index=False)
+    rows['calendar_sick_holidays'] = len(calendar)
+    return rows
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Генерация синтетических CSV в схемах output/')
+    parser.add_argument('--output-dir', required=True)
+    parser.add_argument('--employees', type=int, default=250)
+    parser.add_argument('--years', type=int, default=1)
+    parser.add_argument('--tasks-per-day', type=float, default=2.0)
+    parser.add_argument('--start-year', type=int, default=2025)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args(argv)
+
+    rows = generate(
+        args.output_dir, employees=args.employees, years=args.years,
+        tasks_per_day=args.tasks_per_day, start_year=args.start_year, seed=args.seed,
+    )
+    for family, count in rows.items():
+        print(f'{family}: {count} строк')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,191 @@
+"""Бенчмарк загрузки данных и вычислений для визуализаций дашборда.
+
+Для каждого масштаба генерирует синтетические данные, замеряет время и
+пиковую память (tracemalloc) этапов и пишет результаты в JSON. Этапы:
+холодная и тёплая загрузка load_dataset, открытие снимка, загрузка партиции заданий,
+полный и инкрементальный (последний месяц) расчёт сигналов о падении очков и
+вычисления четырёх визуализаций (данные, итоги и сериализация графика)
+для выборки сотрудников.
+
+    python -m bench.run --scale 250x1x2 --scale 2000x2x3 --output bench/results.json
+    python -m bench.run --compare old.json new.json
+"""
+
+import argparse
+import json
+import platform
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from bench.generate import generate
+from skills_dashboard import anomalies, figures, snapshot, views
+from skills_dashboard.dataset import load_dataset
+from skills_dashboard.task_store import TaskStore
+
+
+def measure(func, repeat=1):
+    """Время одного вызова (среднее по repeat) и пиковая память отдельного прогона под tracemalloc."""
+    started = time.perf_counter()
+    for _ in range(repeat):
+        result = func()
+    wall = (time.perf_counter() - started) / repeat
+
+    tracemalloc.start()
+    func()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, {'wall_s': round(wall, 6), 'peak_mb': round(peak / 2**20, 3), 'calls': repeat}
+
+
+def parse_scale(text):
+    """'сотрудники x годы x заданий в день', например '10000x5x3'."""
+    employees, years, tasks_per_day = text.lower().split('x')
+    return {'employees': int(employees), 'years': int(years), 'tasks_per_day': float(tasks_per_day)}
+
+
+def view_stages(data, task_store, employee_ids, months):
+    """Функции этапов для каждой визуализации на выборке сотрудников."""
+
+    def daily_points():
+        for employee_id in employee_ids:
+            points, _ = views.daily_points(data, employee_id)
+            figures.daily_points_figure(points, employee_id, '', '', '#1f77b4').to_json()
+
+    def month_daily_points():
+        for employee_id, month in zip(employee_ids, months):
+            points, _ = views.month_daily_points(data, employee_id, month)
+            figures.daily_points_figure(points, employee_id, '', '', '#d62728').to_json()
+
+    def month_task_detail():
+        for employee_id, month in zip(employee_ids, months):
+            _, grouped = views.month_task_detail(task_store, employee_id, month)
+            if len(grouped) > 0:
+                figures.top_products_figure(grouped, month).to_json()
+
+    def monthly_average():
+        for employee_id in employee_ids:
+            months_data, _ = views.monthly_average(data, employee_id)
+            figures.monthly_average_figure(months_data, employee_id, '', '').to_json()
+
+    def skills():
+        for employee_id in employee_ids:
+            months_data, _ = views.skills(data, employee_id)
+            figures.skills_figure(months_data, employee_id, '', '').to_json()
+
+    return {
+        'view_daily_points': daily_points,
+        'view_month_daily_points': month_daily_points,
+        'view_month_task_detail': month_task_detail,
+        'view_monthly_average': monthly_average,
+        'view_skills': skills,
+    }
+
+
+def run_scale(scale, workdir, sample=20, seed=0):
+    """Прогоняет все этапы на одном масштабе данных."""
+    output_dir = Path(workdir) / 'output'
+    started = time.perf_counter()
+    rows = generate(output_dir, seed=seed, **scale)
+    generate_s = time.perf_counter() - started
+
+    stages = {}
+    cache_dirs = iter(Path(workdir) / f'cache_{i}' for i in range(2))
+
+    # Холодная загрузка: каждый прогон с пустым кешем партиций
+    _, stages['load_cold'] = measure(lambda: load_dataset(output_dir, next(cache_dirs)))
+    warm_cache = Path(workdir) / 'cache_1'
+    data, stages['load_warm'] = measure(lambda: load_dataset(output_dir, warm_cache))
+    snapshot.write_snapshot(data, 'bench', warm_cache)
+    _, stages['load_snapshot'] = measure(lambda: snapshot.open_snapshot('bench', warm_cache))
+
+    month_options = [str(month) for month in data.points.frame['date'].dt.to_period('M').unique()]
+    employee_month = data.employee_month.frame
+    _, stages['alerts_full'] = measure(lambda: anomalies.detect(data.points.frame, employee_month))
+    _, stages['alerts_incremental'] = measure(
+        lambda: anomalies.detect(data.points.frame, employee_month, since=int(employee_month['month_key'].max()))
+    )
+    rng = np.random.default_rng(seed)
+    employee_ids = rng.choice(list(data.points.offsets), size=min(sample, len(data.points.offsets)), replace=False)
+    months = rng.choice(month_options, size=len(employee_ids))
+    employee_ids = employee_ids.tolist()
+
+    _, stages['task_partition_load'] = measure(
+        lambda: TaskStore(output_dir=output_dir, cache_dir=warm_cache).month(months[0])
+    )
+
+    # Партиции заданий прогреваем заранее: их загрузка замерена отдельно
+    task_store = TaskStore(output_dir=output_dir, cache_dir=warm_cache)
+    for month in set(months):
+        task_store.month(month)
+
+    for name, func in view_stages(data, task_store, employee_ids, months).items():
+        _, stats = measure(func)
+        stats['per_employee_ms'] = round(stats['wall_s'] / len(employee_ids) * 1000, 3)
+        stages[name] = stats
+
+    return {'scale': scale, 'rows': rows, 'generate_s': round(generate_s, 3), 'sample': len(employee_ids), 'stages': stages}
+
+
+def compare(old_path, new_path):
+    """Таблица изменения времени этапов между двумя файлами результатов."""
+    old = json.loads(Path(old_path).read_text(encoding='utf-8'))
+    new = json.loads(Path(new_path).read_text(encoding='utf-8'))
+    records = []
+    for old_run, new_run in zip(old['runs'], new['runs']):
+        label = 'x'.join(str(value) for value in new_run['scale'].values())
+        for stage, stats in new_run['stages'].items():
+            before = old_run['stages'].get(stage, {}).get('wall_s')
+            records.append({
+                'scale': label,
+                'stage': stage,
+                'old_s': before,
+                'new_s': stats['wall_s'],
+                'speedup': round(before / stats['wall_s'], 2) if before else None,
+            })
+    return pd.DataFrame(records)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Бенчмарк дашборда вне Streamlit')
+    parser.add_argument('--scale', action='append', help='сотрудники x годы x заданий в день, например 2000x2x3')
+    parser.add_argument('--sample', type=int, default=20, help='число сотрудников для замера визуализаций')
+    parser.add_argument('--output', default='bench/results.json')
+    parser.add_argument('--compare', nargs=2, metavar=('OLD', 'NEW'))
+    args = parser.parse_args(argv)
+
+    if args.compare:
+        print(compare(*args.compare).to_string(index=False))
+        return
+
+    runs = []
+    for text in args.scale or ['250x1x2']:
+        scale = parse_scale(text)
+        with tempfile.TemporaryDirectory(prefix='skills_bench_') as workdir:
+            run = run_scale(scale, workdir, sample=args.sample)
+        runs.append(run)
+        for stage, stats in run['stages'].items():
+            print(f"{text:>12} {stage:<26} {stats['wall_s']:>10.4f} s {stats['peak_mb']:>10.2f} MiB")
+
+    results = {
+        'meta': {
+            'timestamp': datetime.now().isoformat(timespec='seconds'),
+            'python': platform.python_version(),
+            'pandas': pd.__version__,
+            'numpy': np.__version__,
+            'machine': platform.machine(),
+        },
+        'runs': runs,
+    }
+    Path(args.output).parent.mkdir(parents=True, exist_ok=True)
+    Path(args.output).write_text(json.dumps(results, ensure_ascii=False, indent=1), encoding='utf-8')
+    print(f'Результаты: {args.output}')
+
+
+if __name__ == '__main__':
+    main()
@@ -1,9 +1,19 @@
 import streamlit as st
-import pandas as pd
-import plotly.express as px
-import plotly.graph_objects as go
-from datetime import datetime
-import numpy as np
+from streamlit.runtime.scriptrunner import get_script_run_ctx
+
+from skills_dashboard import anomalies, figures, instrumentation, views
+from skills_dashboard.filters import FilterOptions
+from skills_dashboard.leaderboard import build_leaderboard
+from skills_dashboard.live import DataStore
+from skills_dashboard.matrix import PointsMatrix
+from skills_dashboard.products import METRICS as PRODUCT_METRICS
+from skills_dashboard.products import build_product_stats, load_product_tasks
+from skills_dashboard.render_cache import RenderCache
+from skills_dashboard.task_detail import PAGE_SIZES, SORTS, page_count
+from skills_dashboard.task_store import employee_areas
+
+# Как часто страница проверяет, не обновились ли данные в фоне (секунды)
+LIVE_RELOAD_SECONDS = 5
 
 # Настройка страницы
 st.set_page_config(
@@ -13,113 +23,97 @@ st.set_page_config(
     initial_sidebar_state="expanded"
 )
 
+# Замеры этапов этого перезапуска
+script_run_ctx = get_script_run_ctx()
+profiler = instrumentation.start(session=script_run_ctx.session_id if script_run_ctx else None)
+
 # Заголовок
 st.title("📊 Анализ очков сотрудников")
 st.markdown("---")
 
-@st.cache_data
-def load_data():
-    """Загружает и подготавливает все необходимые данные"""
-    
-    # Загружаем данные employee_points_daily
-    employee_points_daily_january = pd.read_csv('output/employee_points_daily_2025_01.csv')
-    employee_points_daily_february = pd.read_csv('output/employee_points_daily_2025_02.csv')
-    employee_points_daily_march = pd.read_csv('output/employee_points_daily_2025_03.csv')
-    employee_points_daily_april = pd.read_csv('output/employee_points_daily_2025_04.csv')
-    employee_points_daily_may = pd.read_csv('output/employee_points_daily_2025_05.csv')
-    employee_points_daily_june = pd.read_csv('output/employee_points_daily_2025_06.csv')
-    employee_points_daily_july = pd.read_csv('output/employee_points_daily_2025_07.csv')
-    employee_points_daily_august = pd.read_csv('output/employee_points_daily_2025_08.csv')
-
-    # Объединяем данные employee_points_daily
-    employee_points_daily_full = pd.concat([
-        employee_points_daily_january, employee_points_daily_february, employee_points_daily_march, 
-        employee_points_daily_april, employee_points_daily_may, employee_points_daily_june, 
-        employee_points_daily_july, employee_points_daily_august
-    ])
-
-    # Загружаем данные skills_mark
-    skills_mark_january = pd.read_csv('output/rating_linear_col9_2025_01.csv')
-    skills_mark_february = pd.read_csv('output/rating_linear_col9_2025_02.csv')
-    skills_mark_march = pd.read_csv('output/rating_linear_col9_2025_03.csv')
-    skills_mark_april = pd.read_csv('output/rating_linear_col9_2025_04.csv')
-    skills_mark_may = pd.read_csv('output/rating_linear_col9_2025_05.csv')
-    skills_mark_june = pd.read_csv('output/rating_linear_col9_2025_06.csv')
-    skills_mark_july = pd.read_csv('output/rating_linear_col9_2025_07.csv')
-    skills_mark_august = pd.read_csv('output/rating_linear_col9_2025_08.csv')
-
-    # Объединяем данные skills_mark
-    skills_mark_full = pd.concat([
-        skills_mark_january, skills_mark_february, skills_mark_march, skills_mark_april,
-        skills_mark_may, skills_mark_june, skills_mark_july, skills_mark_august
-    ])
-
-    # Загружаем детальные данные по заданиям
-    tasks_full_january = pd.read_csv('output/employee_daily_tasks_points_full_2025_01.csv')
-    tasks_full_february = pd.read_csv('output/employee_daily_tasks_points_full_2025_02.csv')
-    tasks_full_march = pd.read_csv('output/employee_daily_tasks_points_full_2025_03.csv')
-    tasks_full_april = pd.read_csv('output/employee_daily_tasks_points_full_2025_04.csv')
-    tasks_full_may = pd.read_csv('output/employee_daily_tasks_points_full_2025_05.csv')
-    tasks_full_june = pd.read_csv('output/employee_daily_tasks_points_full_2025_06.csv')
-    tasks_full_july = pd.read_csv('output/employee_daily_tasks_points_full_2025_07.csv')
-    tasks_full_august = pd.read_csv('output/employee_daily_tasks_points_full_2025_08.csv')
-
-    # Объединяем детальные данные
-    tasks_full = pd.concat([
-        tasks_full_january, tasks_full_february, tasks_full_march, tasks_full_april,
-        tasks_full_may, tasks_full_june, tasks_full_july, tasks_full_august
-    ])
-
-    # Создаем маппинг ID сотрудника на имя
-    employee_name_mapping = skills_mark_full[['id_employee', 'fio_employee']].drop_duplicates()
-
-    # Добавляем имена сотрудников в employee_points_daily_full
-    employee_points_daily_full = employee_points_daily_full.merge(
-        employee_name_mapping, 
-        on='id_employee', 
-        how='left'
-    )
+@st.cache_resource
+def get_data_store():
+    """Общее для всех сессий хранилище данных с наблюдением за output/.
 
-    # Добавляем имена сотрудников в tasks_full
-    tasks_full = tasks_full.merge(
-        employee_name_mapping, 
-        on='id_employee', 
-        how='left'
-    )
+    При изменении файлов фоновый поток заново разбирает только изменённые
+    месяцы и атомарно подменяет снимок данных. Таблицы разделяются между
+    сессиями без копирования, изменять их нельзя.
+    """
+    instrumentation.cache_miss('data_store')
+    store = DataStore()
+    store.watch()
+    return store
 
-    # Преобразуем дату в правильный формат
-    employee_points_daily_full['date'] = pd.to_datetime(employee_points_daily_full['date'])
-    employee_points_daily_full = employee_points_daily_full.sort_values('date')
+@st.cache_resource(max_entries=1)
+def get_filter_options(data_version, _data):
+    """Списки сотрудников и месяцев для фильтров и периоды данных для футера."""
+    instrumentation.cache_miss('filter_options')
+    return FilterOptions(_data)
 
-    tasks_full['date'] = pd.to_datetime(tasks_full['date'])
-    tasks_full = tasks_full.sort_values('date')
+@st.cache_resource(max_entries=1)
+def get_points_matrix(data_version, _data):
+    """Матрица очков сотрудник × день для сравнения сотрудников."""
+    instrumentation.cache_miss('points_matrix')
+    return PointsMatrix(_data.points.frame)
 
-    # Создаем колонку с датой для skills_mark (первое число месяца)
-    skills_mark_full['date'] = pd.to_datetime(skills_mark_full[['year', 'month']].assign(day=1))
-    skills_mark_full = skills_mark_full.sort_values('date')
+@st.cache_resource(max_entries=1)
+def get_employee_areas(data_version):
+    """Основной участок каждого сотрудника по заданиям."""
+    instrumentation.cache_miss('employee_areas')
+    return employee_areas()
 
-    # Загружаем данные о больничных и отпусках
-    calendar_sick_holidays = pd.read_csv('output/calendar_sick_holidays.csv')
-    
-    # Создаем колонку с датой для calendar_sick_holidays (первое число месяца)
-    calendar_sick_holidays['date'] = pd.to_datetime(calendar_sick_holidays[['year', 'month']].assign(day=1))
-    calendar_sick_holidays = calendar_sick_holidays.sort_values('date')
+@st.cache_resource(max_entries=1)
+def get_leaderboard(data_version, _data):
+    """Рейтинг всех сотрудников по месяцам с местами и процентилями."""
+    instrumentation.cache_miss('leaderboard')
+    return build_leaderboard(_data.employee_month.frame, _data.employees, get_employee_areas(data_version))
+
+@st.cache_resource(max_entries=1)
+def get_product_stats(data_version, _data):
+    """Агрегаты изделие × месяц и обратный индекс изделие -> сотрудники."""
+    instrumentation.cache_miss('product_stats')
+    return build_product_stats(load_product_tasks(), _data.employees)
+
+@st.cache_resource(max_entries=64)
+def get_task_detail(data_version, employee_id, month):
+    """Подготовленная таблица заданий сотрудника за месяц и агрегат по изделиям."""
+    instrumentation.cache_miss('task_detail')
+    return views.month_task_detail(get_data_store().task_store, employee_id, month)
 
-    return employee_points_daily_full, skills_mark_full, employee_name_mapping, tasks_full, calendar_sick_holidays
+@st.cache_resource
+def get_alert_engine():
+    """Сигналы о падении очков; при новой версии данных пересчитываются только изменённые месяцы."""
+    instrumentation.cache_miss('alert_engine')
+    return anomalies.AlertEngine()
 
-# Загружаем данные
-employee_points_daily_full, skills_mark_full, employee_name_mapping, tasks_full, calendar_sick_holidays = load_data()
+@st.cache_resource
+def get_render_cache():
+    """Общий для всех сессий LRU-кеш готовых графиков и плиток метрик."""
+    instrumentation.cache_miss('render_cache')
+    return RenderCache()
 
-# Создаем списки для фильтров
-employee_data = employee_points_daily_full[['id_employee', 'fio_employee']].drop_duplicates()
-# Убираем строки с NaN в fio_employee
-employee_data = employee_data.dropna(subset=['fio_employee'])
-employee_list = sorted(employee_data.values.tolist())
-employee_options = [f"{emp[0]} - {emp[1]}" for emp in employee_list]
+def show_metrics(tiles):
+    """Выводит плитки st.metric в один ряд: список пар (подпись, значение)."""
+    for column, (label, value) in zip(st.columns(len(tiles)), tiles):
+        with column:
+            st.metric(label, value)
 
-# Получаем уникальные месяцы
-available_months = sorted(employee_points_daily_full['date'].dt.to_period('M').unique())
-month_options = [str(month) for month in available_months]
+# Загружаем данные: снимок (версия, данные) подменяется целиком при обновлении
+store = profiler.cached('data_store', get_data_store)
+data_version, data = store.snapshot()
+render_cache = get_render_cache()
+
+@st.fragment(run_every=LIVE_RELOAD_SECONDS)
+def watch_data_version():
+    """Перезапускает страницу, когда в фоне появилась новая версия данных."""
+    if store.version != data_version:
+        st.rerun()
+
+watch_data_version()
+
+# Списки для фильтров готовятся один раз на версию данных
+filter_options = profiler.cached('filter_options', get_filter_options, data_version, data)
+month_options = filter_options.months
 
 # Боковая панель с фильтрами
 st.sidebar.header("🔧 Фильтры")
@@ -131,78 +125,80 @@ visualization = st.sidebar.selectbox(
         "Ежедневные очки (фильтр по сотруднику)",
         "Ежедневные очки по месяцу (фильтр по сотруднику и месяцу)",
         "Месячные средние очки (фильтр по месяцу и сотруднику)", 
-        "Skills Mark (фильтр по сотруднику)"
+        "Skills Mark (фильтр по сотруднику)",
+        "Сравнение сотрудников (фильтр по сотрудникам или участку)",
+        "Рейтинг сотрудников (фильтр по месяцу и участку)",
+        "Аналитика по изделиям (фильтр по месяцу и изделию)",
+        "Сигналы о падении очков (фильтр по месяцу и участку)"
     ]
 )
 
+profiler.view = visualization
 st.markdown(f"## {visualization}")
 
 if visualization == "Ежедневные очки (фильтр по сотруднику)":
     # Фильтр по сотруднику
-    selected_employee = st.sidebar.selectbox(
+    selected_employee_id = st.sidebar.selectbox(
         "Выберите сотрудника:",
-        employee_options,
-        index=0
-    )
-    
-    # Извлекаем ID сотрудника
-    selected_employee_id = int(selected_employee.split(' - ')[0])
-    selected_employee_name = selected_employee.split(' - ')[1] if ' - ' in selected_employee else "Неизвестно"
-    
-    # Фильтруем данные
-    filtered_data = employee_points_daily_full[employee_points_daily_full['id_employee'] == selected_employee_id]
-    
-    # Создаем график
-    fig = go.Figure()
-    
-    fig.add_trace(go.Scatter(
-        x=filtered_data['date'],
-        y=filtered_data['points'],
-        mode='lines+markers',
-        name=f"ID: {selected_employee_id}",
-        line=dict(width=3, color='#1f77b4'),
-        marker=dict(size=6),
-        hovertemplate=f'<b>ID: {selected_employee_id}</b><br>' +
-                     f'<b>Имя: {selected_employee_name}</b><br>' +
-                     'Дата: %{x}<br>' +
-                     'Очки: %{y}<br>' +
-                     '<extra></extra>'
-    ))
-    
-    fig.update_layout(
-        title=f'Ежедневная динамика очков: {selected_employee}',
-        xaxis_title='Дата',
-        yaxis_title='Количество очков',
-        width=1200,
-        height=600,
-        hovermode='x unified'
+        filter_options.employee_ids,
+        index=0,
+        format_func=filter_options.label
     )
+    selected_employee = filter_options.label(selected_employee_id)
+    selected_employee_name = filter_options.name(selected_employee_id)
+    
+    # Фильтруем данные и берем итоги за весь период из таблицы сотрудник × месяц
+    with profiler.stage('query') as stage:
+        filtered_data, summary = views.daily_points(data, selected_employee_id)
+        stage['rows'] = len(filtered_data)
+    
+    # Длинный ряд прореживается на сервере; при сужении периода
+    # точки заново берутся из индекса в полном разрешении
+    chart_data = filtered_data
+    chart_window = None
+    if len(filtered_data) > figures.DOWNSAMPLE_THRESHOLD:
+        first_date = filtered_data['date'].iloc[0].date()
+        last_date = filtered_data['date'].iloc[-1].date()
+        date_from, date_to = st.sidebar.slider(
+            "Период графика:",
+            min_value=first_date,
+            max_value=last_date,
+            value=(first_date, last_date)
+        )
+        chart_window = (date_from, date_to)
+        with profiler.stage('window_query') as stage:
+            chart_data = views.daily_points_window(data, selected_employee_id, date_from, date_to)
+            stage['rows'] = len(chart_data)
+        if len(chart_data) > figures.DOWNSAMPLE_THRESHOLD:
+            st.caption(
+                f"График прорежен до {figures.DOWNSAMPLE_THRESHOLD} из {len(chart_data)} точек (LTTB). "
+                "Сузьте период графика, чтобы увидеть все точки."
+            )
     
-    st.plotly_chart(fig, use_container_width=True)
+    # Создаем график и плитки; повторный просмотр берет их из общего кеша
+    def build_daily():
+        with profiler.stage('figure'):
+            fig = figures.daily_points_figure(
+                chart_data, selected_employee_id, selected_employee_name,
+                title=f'Ежедневная динамика очков: {selected_employee}',
+                color='#1f77b4',
+            )
+        return {'figure': fig, 'tiles': [
+            ("Общее количество очков", f"{summary['points_sum']:.0f}"),
+            ("Средние очки", f"{summary['points_mean']:.2f}"),
+            ("Максимальные очки", f"{summary['points_max']:.0f}"),
+            ("Количество дней", f"{summary['days']}"),
+            ("Больничные дни (всего)", f"{summary['sick_count']:.0f}"),
+            ("Отпускные дни (всего)", f"{summary['holidays_count']:.0f}"),
+        ]}
     
-    # Получаем данные о больничных и отпусках за весь период
-    sick_holiday_data = calendar_sick_holidays[
-        calendar_sick_holidays['id_employee'] == selected_employee_id
-    ]
+    rendered = render_cache.get(data_version, ('daily', selected_employee_id, chart_window), build_daily)
     
-    # Извлекаем общее количество больничных и отпуска дней
-    total_sick_days = sick_holiday_data['sick_count'].sum() if len(sick_holiday_data) > 0 else 0
-    total_holiday_days = sick_holiday_data['holidays_count'].sum() if len(sick_holiday_data) > 0 else 0
+    with profiler.stage('plotly_chart'):
+        st.plotly_chart(rendered['figure'], use_container_width=True)
     
     # Статистика
-    col1, col2, col3, col4, col5, col6 = st.columns(6)
-    with col1:
-        st.metric("Общее количество очков", f"{filtered_data['points'].sum():.0f}")
-    with col2:
-        st.metric("Средние очки", f"{filtered_data['points'].mean():.2f}")
-    with col3:
-        st.metric("Максимальные очки", f"{filtered_data['points'].max():.0f}")
-    with col4:
-        st.metric("Количество дней", f"{len(filtered_data)}")
-    with col5:
-        st.metric("Больничные дни (всего)", f"{total_sick_days:.0f}")
-    with col6:
-        st.metric("Отпускные дни (всего)", f"{total_holiday_days:.0f}")
+    show_metrics(rendered['tiles'])
 
 elif visualization == "Ежедневные очки по месяцу (фильтр по сотруднику и месяцу)":
     # Фильтры
@@ -212,128 +208,122 @@ elif visualization == "Ежедневные очки по месяцу (филь
         index=0
     )
     
-    selected_employee = st.sidebar.selectbox(
+    selected_employee_id = st.sidebar.selectbox(
         "Выберите сотрудника:",
-        employee_options,
-        index=0
-    )
-    
-    # Извлекаем ID сотрудника
-    selected_employee_id = int(selected_employee.split(' - ')[0])
-    selected_employee_name = selected_employee.split(' - ')[1] if ' - ' in selected_employee else "Неизвестно"
-    
-    # Преобразуем выбранный месяц в период
-    selected_month_period = pd.to_datetime(selected_month)
-    
-    # Фильтруем данные по месяцу и сотруднику
-    filtered_data = employee_points_daily_full[
-        (employee_points_daily_full['id_employee'] == selected_employee_id) &
-        (employee_points_daily_full['date'].dt.to_period('M') == selected_month_period.to_period('M'))
-    ]
-    
-    # Создаем график
-    fig = go.Figure()
-    
-    fig.add_trace(go.Scatter(
-        x=filtered_data['date'],
-        y=filtered_data['points'],
-        mode='lines+markers',
-        name=f"ID: {selected_employee_id}",
-        line=dict(width=3, color='#d62728'),
-        marker=dict(size=6),
-        hovertemplate=f'<b>ID: {selected_employee_id}</b><br>' +
-                     f'<b>Имя: {selected_employee_name}</b><br>' +
-                     'Дата: %{x}<br>' +
-                     'Очки: %{y}<br>' +
-                     '<extra></extra>'
-    ))
-    
-    fig.update_layout(
-        title=f'Ежедневные очки за {selected_month}: {selected_employee}',
-        xaxis_title='Дата',
-        yaxis_title='Количество очков',
-        width=1200,
-        height=600,
-        hovermode='x unified'
+        filter_options.employee_ids,
+        index=0,
+        format_func=filter_options.label
     )
+    selected_employee = filter_options.label(selected_employee_id)
+    selected_employee_name = filter_options.name(selected_employee_id)
+    
+    def build_month_daily():
+        # Фильтруем данные по месяцу и сотруднику, итоги берем из таблицы сотрудник × месяц
+        with profiler.stage('query') as stage:
+            filtered_data, summary = views.month_daily_points(data, selected_employee_id, selected_month)
+            stage['rows'] = len(filtered_data)
+        
+        # Создаем график
+        with profiler.stage('figure'):
+            fig = figures.daily_points_figure(
+                filtered_data, selected_employee_id, selected_employee_name,
+                title=f'Ежедневные очки за {selected_month}: {selected_employee}',
+                color='#d62728',
+            )
+        return {'figure': fig, 'days': summary['days'], 'tiles': [
+            ("Общее количество очков", f"{summary['points_sum']:.0f}"),
+            ("Средние очки", f"{summary['points_mean']:.2f}"),
+            ("Максимальные очки", f"{summary['points_max']:.0f}"),
+            ("Количество дней", f"{summary['days']}"),
+            ("Больничные дни", f"{summary['sick_count']:.0f}"),
+            ("Отпускные дни", f"{summary['holidays_count']:.0f}"),
+        ]}
     
-    st.plotly_chart(fig, use_container_width=True)
-    
-    # Получаем данные о больничных и отпусках за выбранный месяц
-    selected_month_period_obj = selected_month_period.to_period('M')
-    sick_holiday_data = calendar_sick_holidays[
-        (calendar_sick_holidays['id_employee'] == selected_employee_id) &
-        (calendar_sick_holidays['date'].dt.to_period('M') == selected_month_period_obj)
-    ]
+    rendered = render_cache.get(data_version, ('month_daily', selected_employee_id, selected_month), build_month_daily)
     
-    # Извлекаем количество больничных и отпуска дней
-    sick_days = sick_holiday_data['sick_count'].sum() if len(sick_holiday_data) > 0 else 0
-    holiday_days = sick_holiday_data['holidays_count'].sum() if len(sick_holiday_data) > 0 else 0
+    with profiler.stage('plotly_chart'):
+        st.plotly_chart(rendered['figure'], use_container_width=True)
     
     # Статистика
-    col1, col2, col3, col4, col5, col6 = st.columns(6)
-    with col1:
-        st.metric("Общее количество очков", f"{filtered_data['points'].sum():.0f}")
-    with col2:
-        st.metric("Средние очки", f"{filtered_data['points'].mean():.2f}")
-    with col3:
-        st.metric("Максимальные очки", f"{filtered_data['points'].max():.0f}")
-    with col4:
-        st.metric("Количество дней", f"{len(filtered_data)}")
-    with col5:
-        st.metric("Больничные дни", f"{sick_days:.0f}")
-    with col6:
-        st.metric("Отпускные дни", f"{holiday_days:.0f}")
+    show_metrics(rendered['tiles'])
     
     # Детализация по изделиям за весь месяц
     st.markdown("### 🔍 Детализация по изделиям за весь месяц")
     
-    if len(filtered_data) > 0:
-        # Получаем детальные данные за весь выбранный месяц
-        detailed_data = tasks_full[
-            (tasks_full['id_employee'] == selected_employee_id) &
-            (tasks_full['date'].dt.to_period('M') == selected_month_period.to_period('M'))
-        ]
+    if rendered['days'] > 0:
+        # Подготовленная таблица кешируется: сортировка и фильтры работают по ней
+        task_table, grouped_for_chart = profiler.cached(
+            'task_detail', get_task_detail, data_version, selected_employee_id, selected_month
+        )
         
-        if len(detailed_data) > 0:
-            # Создаем копию данных и форматируем дату
-            detailed_data_display = detailed_data.copy()
-            detailed_data_display['date_formatted'] = detailed_data_display['date'].dt.date
+        if task_table is not None:
+            st.markdown(f"**Детализация за {selected_month}:**")
             
-            # Сортируем по дате и очкам
-            detailed_data_sorted = detailed_data_display.sort_values(['date', 'points'], ascending=[True, False])
+            # Фильтры таблицы
+            col1, col2, col3 = st.columns(3)
+            with col1:
+                detail_date = st.selectbox("Дата:", ["Все даты"] + task_table.dates)
+            with col2:
+                product_filter = {"Все изделия": None}
+                for product in task_table.products.itertuples(index=False):
+                    product_filter[f"{product.sap_id} - {product.sap_name}"] = product.sap_id
+                detail_product = st.selectbox("Изделие:", list(product_filter))
+            with col3:
+                detail_area = st.selectbox("Участок:", ["Все участки"] + task_table.areas)
             
-            st.markdown(f"**Детализация за {selected_month}:**")
+            # Сортировка и страница
+            col1, col2, col3, col4 = st.columns(4)
+            with col1:
+                detail_sort = st.selectbox("Сортировать по:", list(SORTS))
+            with col2:
+                detail_order = st.radio("Порядок:", ["По возрастанию", "По убыванию"], horizontal=True)
+            with col3:
+                page_size = st.selectbox("Строк на странице:", PAGE_SIZES, index=PAGE_SIZES.index(50))
             
-            # Показываем таблицу со всеми записями
-            st.dataframe(
-                detailed_data_sorted[['date_formatted', 'sap_id', 'sap_name', 'points', 'units_made', 'norma_product_adjusted_with_discounts']].head(50),
-                use_container_width=True,
-                column_config={
-                    "date_formatted": "Дата",
-                    "sap_id": "SAP ID",
-                    "sap_name": "Название изделия",
-                    "points": "Очки",
-                    "units_made": "Количество",
-                    "norma_product_adjusted_with_discounts": "Норма с учетом скидок"
-                }
-            )
+            with profiler.stage('task_page_query') as stage:
+                positions = task_table.query(
+                    detail_sort,
+                    ascending=detail_order == "По возрастанию",
+                    date=None if detail_date == "Все даты" else detail_date,
+                    sap_id=product_filter[detail_product],
+                    area=None if detail_area == "Все участки" else detail_area,
+                )
+                stage['rows'] = len(positions)
             
-            # График по изделиям (агрегируем только для графика)
-            grouped_for_chart = detailed_data.groupby(['sap_id', 'sap_name']).agg({
-                'points': 'sum'
-            }).reset_index().sort_values('points', ascending=False)
+            pages = page_count(len(positions), page_size)
+            with col4:
+                # Число страниц в подписи: при смене фильтров номер страницы сбрасывается
+                page = st.number_input(f"Страница (из {pages}):", min_value=1, max_value=pages, value=1)
             
+            # Показываем только строки текущей страницы
+            with profiler.stage('dataframe'):
+                st.dataframe(
+                    task_table.page(positions, page, page_size)[['date_formatted', 'sap_id', 'sap_name', 'area', 'points', 'units_made', 'norma_product_adjusted_with_discounts']],
+                    use_container_width=True,
+                    column_config={
+                        "date_formatted": "Дата",
+                        "sap_id": "SAP ID",
+                        "sap_name": "Название изделия",
+                        "area": "Участок",
+                        "points": "Очки",
+                        "units_made": "Количество",
+                        "norma_product_adjusted_with_discounts": "Норма с учетом скидок"
+                    }
+                )
+            first_row = (page - 1) * page_size
+            st.caption(f"Строки {min(first_row + 1, len(positions))}–{min(first_row + page_size, len(positions))} из {len(positions)}")
+            
+            # График по изделиям
             if len(grouped_for_chart) > 0:
-                fig_products = px.bar(
-                    grouped_for_chart.head(10),
-                    x='sap_name',
-                    y='points',
-                    title=f'Топ-10 изделий по общим очкам за {selected_month}',
-                    labels={'sap_name': 'Название изделия', 'points': 'Очки'}
+                def build_top_products():
+                    with profiler.stage('products_figure', rows=len(grouped_for_chart)):
+                        return {'figure': figures.top_products_figure(grouped_for_chart, selected_month)}
+                
+                products_rendered = render_cache.get(
+                    data_version, ('top_products', selected_employee_id, selected_month), build_top_products
                 )
-                fig_products.update_xaxes(tickangle=45)
-                st.plotly_chart(fig_products, use_container_width=True)
+                with profiler.stage('products_plotly_chart'):
+                    st.plotly_chart(products_rendered['figure'], use_container_width=True)
         else:
             st.warning(f"Нет детальных данных за {selected_month}")
     else:
@@ -347,150 +337,353 @@ elif visualization == "Месячные средние очки (фильтр п
         index=0
     )
     
-    selected_employee = st.sidebar.selectbox(
+    selected_employee_id = st.sidebar.selectbox(
         "Выберите сотрудника:",
-        employee_options,
-        index=0
-    )
-    
-    # Извлекаем ID сотрудника
-    selected_employee_id = int(selected_employee.split(' - ')[0])
-    selected_employee_name = selected_employee.split(' - ')[1] if ' - ' in selected_employee else "Неизвестно"
-    
-    # Создаем агрегированные данные по месяцам
-    monthly_avg = employee_points_daily_full.groupby([
-        employee_points_daily_full['date'].dt.to_period('M'), 
-        'id_employee'
-    ])['points'].mean().reset_index()
-    
-    # Преобразуем период в дату
-    monthly_avg['date'] = monthly_avg['date'].astype(str)
-    monthly_avg['date'] = pd.to_datetime(monthly_avg['date'])
-    
-    # Добавляем имена сотрудников
-    monthly_avg = monthly_avg.merge(employee_name_mapping, on='id_employee', how='left')
-    
-    # Фильтруем данные
-    filtered_data = monthly_avg[monthly_avg['id_employee'] == selected_employee_id]
-    
-    # Создаем график
-    fig = go.Figure()
-    
-    fig.add_trace(go.Scatter(
-        x=filtered_data['date'],
-        y=filtered_data['points'],
-        mode='lines+markers',
-        name=f"ID: {selected_employee_id}",
-        line=dict(width=4, color='#ff7f0e'),
-        marker=dict(size=10),
-        hovertemplate=f'<b>ID: {selected_employee_id}</b><br>' +
-                     f'<b>Имя: {selected_employee_name}</b><br>' +
-                     'Месяц: %{x}<br>' +
-                     'Средние очки: %{y:.2f}<br>' +
-                     '<extra></extra>'
-    ))
-    
-    fig.update_layout(
-        title=f'Средние очки по месяцам: {selected_employee}',
-        xaxis_title='Месяц',
-        yaxis_title='Средние очки за месяц',
-        width=1200,
-        height=600,
-        hovermode='x unified'
+        filter_options.employee_ids,
+        index=0,
+        format_func=filter_options.label
     )
+    selected_employee = filter_options.label(selected_employee_id)
+    selected_employee_name = filter_options.name(selected_employee_id)
+    
+    def build_monthly_average():
+        # Берем месяцы с ежедневными очками из таблицы сотрудник × месяц
+        with profiler.stage('query') as stage:
+            filtered_data, summary = views.monthly_average(data, selected_employee_id)
+            stage['rows'] = len(filtered_data)
+        
+        # Создаем график
+        with profiler.stage('figure'):
+            fig = figures.monthly_average_figure(
+                filtered_data, selected_employee_id, selected_employee_name,
+                title=f'Средние очки по месяцам: {selected_employee}',
+            )
+        return {'figure': fig, 'tiles': [
+            ("Средние очки за все месяцы", f"{filtered_data['points_mean'].mean():.2f}"),
+            ("Максимальные средние очки", f"{filtered_data['points_mean'].max():.2f}"),
+            ("Минимальные средние очки", f"{filtered_data['points_mean'].min():.2f}"),
+            ("Количество месяцев", f"{len(filtered_data)}"),
+            ("Больничные дни (всего)", f"{summary['sick_count']:.0f}"),
+            ("Отпускные дни (всего)", f"{summary['holidays_count']:.0f}"),
+        ]}
     
-    st.plotly_chart(fig, use_container_width=True)
+    rendered = render_cache.get(data_version, ('monthly_average', selected_employee_id), build_monthly_average)
     
-    # Получаем данные о больничных и отпусках за весь период
-    sick_holiday_data = calendar_sick_holidays[
-        calendar_sick_holidays['id_employee'] == selected_employee_id
-    ]
-    
-    # Извлекаем общее количество больничных и отпуска дней
-    total_sick_days = sick_holiday_data['sick_count'].sum() if len(sick_holiday_data) > 0 else 0
-    total_holiday_days = sick_holiday_data['holidays_count'].sum() if len(sick_holiday_data) > 0 else 0
+    with profiler.stage('plotly_chart'):
+        st.plotly_chart(rendered['figure'], use_container_width=True)
     
     # Статистика
-    col1, col2, col3, col4, col5, col6 = st.columns(6)
-    with col1:
-        st.metric("Средние очки за все месяцы", f"{filtered_data['points'].mean():.2f}")
-    with col2:
-        st.metric("Максимальные средние очки", f"{filtered_data['points'].max():.2f}")
-    with col3:
-        st.metric("Минимальные средние очки", f"{filtered_data['points'].min():.2f}")
-    with col4:
-        st.metric("Количество месяцев", f"{len(filtered_data)}")
-    with col5:
-        st.metric("Больничные дни (всего)", f"{total_sick_days:.0f}")
-    with col6:
-        st.metric("Отпускные дни (всего)", f"{total_holiday_days:.0f}")
+    show_metrics(rendered['tiles'])
 
 elif visualization == "Skills Mark (фильтр по сотруднику)":
     # Фильтр по сотруднику
-    selected_employee = st.sidebar.selectbox(
+    selected_employee_id = st.sidebar.selectbox(
         "Выберите сотрудника:",
-        employee_options,
+        filter_options.employee_ids,
+        index=0,
+        format_func=filter_options.label
+    )
+    selected_employee = filter_options.label(selected_employee_id)
+    selected_employee_name = filter_options.name(selected_employee_id)
+    
+    def build_skills():
+        # Берем месяцы с оценкой навыков из таблицы сотрудник × месяц
+        with profiler.stage('query') as stage:
+            filtered_data, summary = views.skills(data, selected_employee_id)
+            stage['rows'] = len(filtered_data)
+        
+        # Создаем график
+        with profiler.stage('figure'):
+            fig = figures.skills_figure(
+                filtered_data, selected_employee_id, selected_employee_name,
+                title=f'Динамика Skills Mark: {selected_employee}',
+            )
+        return {'figure': fig, 'tiles': [
+            ("Средний Skills Mark", f"{filtered_data['skills_mark'].mean():.2f}"),
+            ("Максимальный Skills Mark", f"{filtered_data['skills_mark'].max():.0f}"),
+            ("Минимальный Skills Mark", f"{filtered_data['skills_mark'].min():.0f}"),
+            ("Количество месяцев", f"{len(filtered_data)}"),
+            ("Больничные дни (всего)", f"{summary['sick_count']:.0f}"),
+            ("Отпускные дни (всего)", f"{summary['holidays_count']:.0f}"),
+        ]}
+    
+    rendered = render_cache.get(data_version, ('skills', selected_employee_id), build_skills)
+    
+    with profiler.stage('plotly_chart'):
+        st.plotly_chart(rendered['figure'], use_container_width=True)
+    
+    # Статистика
+    show_metrics(rendered['tiles'])
+
+elif visualization == "Сравнение сотрудников (фильтр по сотрудникам или участку)":
+    # Фильтры
+    selection_mode = st.sidebar.radio("Кого сравнивать:", ["Сотрудники", "Участок"])
+    
+    if selection_mode == "Сотрудники":
+        selected_ids = st.sidebar.multiselect(
+            "Выберите сотрудников:",
+            filter_options.employee_ids,
+            default=filter_options.employee_ids[:5],
+            format_func=filter_options.label
+        )
+        selection_title = f"{len(selected_ids)} сотрудников"
+    else:
+        areas = profiler.cached('employee_areas', get_employee_areas, data_version)
+        selected_area = st.sidebar.selectbox(
+            "Выберите участок:",
+            sorted(areas.dropna().unique()),
+            index=0
+        )
+        selected_ids = [employee_id for employee_id in filter_options.employee_ids if areas.get(employee_id) == selected_area]
+        selection_title = f"участок {selected_area}"
+    
+    comparison_metric = st.sidebar.radio("Показатель:", ["Скользящее среднее", "Накопленная сумма"])
+    if comparison_metric == "Скользящее среднее":
+        window = st.sidebar.slider("Окно сглаживания (дней):", min_value=1, max_value=60, value=7)
+        mode = 'rolling'
+        yaxis_title = f'Средние очки за {window} дн.'
+    else:
+        window = 1
+        mode = 'cumulative'
+        yaxis_title = 'Накопленные очки'
+    
+    # Ряды всех выбранных сотрудников из матрицы сотрудник × день
+    matrix = profiler.cached('points_matrix', get_points_matrix, data_version, data)
+    with profiler.stage('query') as stage:
+        series_ids, series = views.compare_employees(matrix, selected_ids, mode, window)
+        stage['rows'] = series.size
+    
+    if len(series_ids) > 0:
+        with profiler.stage('figure'):
+            fig = figures.comparison_figure(
+                matrix.dates,
+                series,
+                labels=[filter_options.label(employee_id) for employee_id in series_ids],
+                title=f'{comparison_metric}: {selection_title}',
+                yaxis_title=yaxis_title,
+            )
+        
+        with profiler.stage('plotly_chart'):
+            st.plotly_chart(fig, use_container_width=True)
+        
+        # Статистика
+        _, totals = matrix.cumulative(series_ids)
+        col1, col2, col3 = st.columns(3)
+        with col1:
+            st.metric("Сотрудников на графике", f"{len(series_ids)}")
+        with col2:
+            st.metric("Дней в периоде", f"{len(matrix.dates)}")
+        with col3:
+            st.metric("Сумма очков выбранных сотрудников", f"{totals[:, -1].sum():.0f}")
+    else:
+        st.warning("Нет данных по выбранным сотрудникам")
+
+elif visualization == "Рейтинг сотрудников (фильтр по месяцу и участку)":
+    leaderboard = profiler.cached('leaderboard', get_leaderboard, data_version, data)
+    
+    # Фильтры
+    selected_month = st.sidebar.selectbox(
+        "Выберите месяц:",
+        month_options,
+        index=len(month_options) - 1
+    )
+    
+    selected_area = st.sidebar.selectbox(
+        "Выберите участок:",
+        ["Все участки"] + leaderboard.areas(),
         index=0
     )
     
-    # Извлекаем ID сотрудника
-    selected_employee_id = int(selected_employee.split(' - ')[0])
-    selected_employee_name = selected_employee.split(' - ')[1] if ' - ' in selected_employee else "Неизвестно"
-    
-    # Фильтруем данные
-    filtered_data = skills_mark_full[skills_mark_full['id_employee'] == selected_employee_id]
-    
-    # Создаем график
-    fig = go.Figure()
-    
-    fig.add_trace(go.Scatter(
-        x=filtered_data['date'],
-        y=filtered_data['skills_mark'],
-        mode='lines+markers',
-        name=f"ID: {selected_employee_id}",
-        line=dict(width=4, color='#2ca02c'),
-        marker=dict(size=10),
-        hovertemplate=f'<b>ID: {selected_employee_id}</b><br>' +
-                     f'<b>Имя: {selected_employee_name}</b><br>' +
-                     'Месяц: %{x}<br>' +
-                     'Skills Mark: %{y}<br>' +
-                     '<extra></extra>'
-    ))
-    
-    fig.update_layout(
-        title=f'Динамика Skills Mark: {selected_employee}',
-        xaxis_title='Месяц',
-        yaxis_title='Skills Mark',
-        width=1200,
-        height=600,
-        hovermode='x unified'
+    ranking_metrics = {
+        "Сумма очков": 'points_sum',
+        "Очки за рабочий день": 'points_per_day',
+        "Skills Mark": 'skills_mark',
+    }
+    ranking_metric = st.sidebar.radio("Сортировать по:", list(ranking_metrics))
+    
+    # Сортировка и фильтр по участку по заранее посчитанным местам
+    with profiler.stage('query') as stage:
+        ranking = leaderboard.ranking(
+            selected_month,
+            ranking_metrics[ranking_metric],
+            area=None if selected_area == "Все участки" else selected_area
+        )
+        stage['rows'] = len(ranking)
+    
+    if len(ranking) > 0:
+        # Статистика
+        col1, col2, col3 = st.columns(3)
+        with col1:
+            st.metric("Сотрудников в рейтинге", f"{len(ranking)}")
+        with col2:
+            st.metric("Медиана очков за месяц", f"{ranking['points_sum'].median():.0f}")
+        with col3:
+            st.metric("Медиана очков за рабочий день", f"{ranking['points_per_day'].median():.2f}")
+        
+        with profiler.stage('dataframe'):
+            st.dataframe(
+                ranking[[
+                    'rank_points_sum', 'rank_points_per_day', 'rank_skills_mark',
+                    'id_employee', 'fio_employee', 'area', 'points_sum', 'pct_points_sum',
+                    'points_per_day', 'pct_points_per_day', 'skills_mark', 'pct_skills_mark', 'days'
+                ]],
+                use_container_width=True,
+                hide_index=True,
+                column_config={
+                    "rank_points_sum": st.column_config.NumberColumn("Место по очкам", format="%d"),
+                    "rank_points_per_day": st.column_config.NumberColumn("Место по очкам в день", format="%d"),
+                    "rank_skills_mark": st.column_config.NumberColumn("Место по Skills Mark", format="%d"),
+                    "id_employee": st.column_config.NumberColumn("ID", format="%d"),
+                    "fio_employee": "Имя",
+                    "area": "Участок",
+                    "points_sum": st.column_config.NumberColumn("Очки за месяц", format="%.0f"),
+                    "pct_points_sum": st.column_config.ProgressColumn("Процентиль (очки)", format="%.0f", min_value=0, max_value=100),
+                    "points_per_day": st.column_config.NumberColumn("Очки за рабочий день", format="%.2f"),
+                    "pct_points_per_day": st.column_config.ProgressColumn("Процентиль (в день)", format="%.0f", min_value=0, max_value=100),
+                    "skills_mark": st.column_config.NumberColumn("Skills Mark", format="%.0f"),
+                    "pct_skills_mark": st.column_config.ProgressColumn("Процентиль (Skills Mark)", format="%.0f", min_value=0, max_value=100),
+                    "days": "Рабочих дней"
+                }
+            )
+        st.caption("Места и процентили считаются среди всех сотрудников завода за месяц.")
+    else:
+        st.warning("Нет данных за выбранный период")
+
+elif visualization == "Аналитика по изделиям (фильтр по месяцу и изделию)":
+    product_stats = profiler.cached('product_stats', get_product_stats, data_version, data)
+    
+    # Фильтры
+    selected_month = st.sidebar.selectbox(
+        "Выберите месяц:",
+        ["Весь период"] + month_options,
+        index=0
     )
+    month = None if selected_month == "Весь период" else selected_month
+    
+    product_metric = st.sidebar.radio("Показатель:", list(PRODUCT_METRICS), format_func=PRODUCT_METRICS.get)
+    top_n = st.sidebar.slider("Количество изделий:", min_value=5, max_value=50, value=10)
+    
+    # Топ изделий - срез заранее посчитанной таблицы изделие × месяц
+    with profiler.stage('query') as stage:
+        top = product_stats.top(month, product_metric, top_n)
+        stage['rows'] = len(top)
+    
+    if len(top) > 0:
+        products = product_stats.product_total if month is None else product_stats.month(month)
+        col1, col2, col3 = st.columns(3)
+        with col1:
+            st.metric("Изделий", f"{len(products)}")
+        with col2:
+            st.metric("Общее количество очков", f"{products['points'].sum():.0f}")
+        with col3:
+            st.metric("Выпуск, шт.", f"{products['units_made'].sum():.0f}")
+        
+        # px.bar строится ~100 мс: при выборе изделия график берется из общего кеша
+        def build_product_top():
+            with profiler.stage('figure'):
+                return {'figure': figures.product_top_figure(
+                    top, product_metric,
+                    title=f"Топ-{top_n} изделий: {PRODUCT_METRICS[product_metric]} ({selected_month})",
+                    yaxis_title=PRODUCT_METRICS[product_metric],
+                )}
+        
+        rendered = render_cache.get(data_version, ('product_top', month, product_metric, top_n), build_product_top)
+        
+        with profiler.stage('plotly_chart'):
+            st.plotly_chart(rendered['figure'], use_container_width=True)
+        
+        # Кто делает изделие - по обратному индексу sap_id -> сотрудники
+        st.markdown("### 👷 Кто делает изделие")
+        product_options = {
+            f"{row.sap_id} - {row.sap_name}": row.sap_id
+            for row in products[['sap_id', 'sap_name']].itertuples(index=False)
+        }
+        selected_product = st.selectbox("Выберите изделие:", list(product_options))
+        
+        with profiler.stage('workers_query') as stage:
+            workers = product_stats.workers_of(product_options[selected_product], month)
+            stage['rows'] = len(workers)
+        
+        with profiler.stage('dataframe'):
+            st.dataframe(
+                workers[['id_employee', 'fio_employee', 'points', 'units_made', 'tasks', 'norm_attainment']],
+                use_container_width=True,
+                hide_index=True,
+                column_config={
+                    "id_employee": st.column_config.NumberColumn("ID", format="%d"),
+                    "fio_employee": "Имя",
+                    "points": st.column_config.NumberColumn("Очки", format="%.1f"),
+                    "units_made": st.column_config.NumberColumn("Выпуск, шт.", format="%.0f"),
+                    "tasks": "Заданий",
+                    "norm_attainment": st.column_config.NumberColumn("Выполнение нормы, %", format="%.1f")
+                }
+            )
+        st.caption("Все названия изделия с одним SAP ID учитываются вместе.")
+    else:
+        st.warning("Нет данных за выбранный период")
+
+elif visualization == "Сигналы о падении очков (фильтр по месяцу и участку)":
+    with profiler.stage('alerts'):
+        alert_table = get_alert_engine().alerts(data_version, data)
+    areas = profiler.cached('employee_areas', get_employee_areas, data_version)
     
-    st.plotly_chart(fig, use_container_width=True)
+    # Фильтры
+    selected_month = st.sidebar.selectbox(
+        "Выберите месяц:",
+        month_options,
+        index=len(month_options) - 1
+    )
     
-    # Получаем данные о больничных и отпусках за весь период
-    sick_holiday_data = calendar_sick_holidays[
-        calendar_sick_holidays['id_employee'] == selected_employee_id
-    ]
+    selected_area = st.sidebar.selectbox(
+        "Выберите участок:",
+        ["Все участки"] + sorted(areas.dropna().unique()),
+        index=0
+    )
     
-    # Извлекаем общее количество больничных и отпуска дней
-    total_sick_days = sick_holiday_data['sick_count'].sum() if len(sick_holiday_data) > 0 else 0
-    total_holiday_days = sick_holiday_data['holidays_count'].sum() if len(sick_holiday_data) > 0 else 0
+    max_z = st.sidebar.slider(
+        "Порог z-оценки:", min_value=-5.0, max_value=anomalies.ALERT_Z, value=anomalies.ALERT_Z, step=0.25
+    )
     
-    # Статистика
-    col1, col2, col3, col4, col5, col6 = st.columns(6)
-    with col1:
-        st.metric("Средний Skills Mark", f"{filtered_data['skills_mark'].mean():.2f}")
-    with col2:
-        st.metric("Максимальный Skills Mark", f"{filtered_data['skills_mark'].max():.0f}")
-    with col3:
-        st.metric("Минимальный Skills Mark", f"{filtered_data['skills_mark'].min():.0f}")
-    with col4:
-        st.metric("Количество месяцев", f"{len(filtered_data)}")
-    with col5:
-        st.metric("Больничные дни (всего)", f"{total_sick_days:.0f}")
-    with col6:
-        st.metric("Отпускные дни (всего)", f"{total_holiday_days:.0f}")
+    # Сигналы месяца - срез заранее посчитанной таблицы
+    with profiler.stage('query') as stage:
+        employee_ids = None if selected_area == "Все участки" else areas.index[areas == selected_area]
+        alerts = alert_table.query(selected_month, max_z, employee_ids)
+        stage['rows'] = len(alerts)
+    
+    if len(alerts) > 0:
+        # Статистика
+        col1, col2, col3 = st.columns(3)
+        with col1:
+            st.metric("Сигналов", f"{len(alerts)}")
+        with col2:
+            st.metric("Сотрудников с сигналами", f"{alerts['id_employee'].nunique()}")
+        with col3:
+            st.metric("Медианное падение, %", f"{alerts['drop_pct'].median():.0f}")
+        
+        with profiler.stage('dataframe'):
+            st.dataframe(
+                alerts.assign(area=alerts['id_employee'].map(areas))[[
+                    'date', 'id_employee', 'fio_employee', 'area', 'points', 'baseline', 'z', 'drop_pct'
+                ]],
+                use_container_width=True,
+                hide_index=True,
+                column_config={
+                    "date": st.column_config.DateColumn("Дата", format="YYYY-MM-DD"),
+                    "id_employee": st.column_config.NumberColumn("ID", format="%d"),
+                    "fio_employee": "Имя",
+                    "area": "Участок",
+                    "points": st.column_config.NumberColumn("Очки", format="%.1f"),
+                    "baseline": st.column_config.NumberColumn("Базовый уровень", format="%.1f"),
+                    "z": st.column_config.NumberColumn("z-оценка", format="%.2f"),
+                    "drop_pct": st.column_config.NumberColumn("Падение, %", format="%.0f")
+                }
+            )
+        st.caption(
+            f"Базовый уровень - средние очки за {anomalies.WINDOW} предыдущих рабочих дней "
+            f"(не меньше {anomalies.MIN_PERIODS}). Месяцы с больничными и отпускными днями не учитываются."
+        )
+    else:
+        st.info("Падений очков за выбранный период не найдено")
 
 # Информация в футере
 st.markdown("---")
@@ -498,10 +691,22 @@ st.markdown("### 📈 Информация о данных")
 col1, col2, col3 = st.columns(3)
 
 with col1:
-    st.metric("Всего сотрудников", f"{len(employee_list)}")
+    st.metric("Всего сотрудников", f"{len(filter_options.employee_ids)}")
 
 with col2:
-    st.metric("Период данных (очки)", f"{employee_points_daily_full['date'].min().strftime('%Y-%m-%d')} - {employee_points_daily_full['date'].max().strftime('%Y-%m-%d')}")
+    points_from, points_to = filter_options.points_period
+    st.metric("Период данных (очки)", f"{points_from.strftime('%Y-%m-%d')} - {points_to.strftime('%Y-%m-%d')}")
 
 with col3:
-    st.metric("Период данных (Skills Mark)", f"{skills_mark_full['date'].min().strftime('%Y-%m')} - {skills_mark_full['date'].max().strftime('%Y-%m')}")
+    skills_from, skills_to = filter_options.skills_period
+    st.metric("Период данных (Skills Mark)", f"{skills_from.strftime('%Y-%m')} - {skills_to.strftime('%Y-%m')}")
+
+# Панель замеров производительности
+show_timings = st.sidebar.checkbox("🐞 Замеры производительности", value=False)
+if show_timings:
+    with st.sidebar.expander("Этапы перезапуска", expanded=True):
+        st.caption(f"Всего: {profiler.total_ms:.1f} мс")
+        st.dataframe(profiler.stages_frame(), hide_index=True, use_container_width=True)
+        st.json(profiler.cache)
+
+profiler.write()
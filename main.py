@@ -1,6 +1,18 @@
-def main():
-    print("Hello from skills-dashboard!")
+"""Пакетная выгрузка месячных отчётов по сотрудникам.
+
+    python main.py --month 2025-06 [--formats html png csv] [--employees ID ...] [--area УЧАСТОК]
+
+Параметры описаны в skills_dashboard.export.
+"""
+
+import sys
+
+from skills_dashboard import export
+
+
+def main(argv=None):
+    return export.main(argv)
 
 
 if __name__ == "__main__":
-    main()
+    sys.exit(main())
@@ -0,0 +1 @@
+"""Слой данных дашборда очков сотрудников."""
@@ -0,0 +1,92 @@
+"""Материализованные агрегаты сотрудник × месяц.
+
+Таблица строится один раз при загрузке, вместо groupby и to_period на
+каждом перезапуске скрипта. Ключ месяца - целое YYYYMM (202501).
+"""
+
+import numpy as np
+import pandas as pd
+
+from skills_dashboard.index import EmployeeIndex
+
+FACT_COLUMNS = [
+    'id_employee', 'month_key', 'date',
+    'points_sum', 'points_mean', 'points_max', 'days',
+    'skills_mark', 'sick_count', 'holidays_count',
+]
+
+
+def month_key(dates):
+    """Целочисленный ключ месяца YYYYMM для серии дат."""
+    return dates.dt.year * 100 + dates.dt.month
+
+
+def build_employee_month(points, skills_mark, calendar):
+    """Строит таблицу сотрудник × месяц.
+
+    points - ежедневные очки (id_employee, date, points);
+    skills_mark и calendar - помесячные таблицы с колонками year, month.
+    Месяцы без ежедневных очков (например, только отпуск) тоже попадают
+    в таблицу: у них days = 0, а среднее и максимум - NaN.
+    """
+    monthly_points = (
+        # Очки хранятся во float32, суммируем во float64
+        points.assign(month_key=month_key(points['date']), points=points['points'].astype(np.float64))
+        .groupby(['id_employee', 'month_key'])['points']
+        .agg(points_sum='sum', points_mean='mean', points_max='max', days='size')
+    )
+
+    monthly_skills = (
+        skills_mark.assign(month_key=skills_mark['year'] * 100 + skills_mark['month'])
+        .set_index(['id_employee', 'month_key'])[['skills_mark']]
+    )
+
+    monthly_calendar = (
+        calendar.assign(month_key=calendar['year'] * 100 + calendar['month'])
+        .set_index(['id_employee', 'month_key'])[['sick_count', 'holidays_count']]
+    )
+
+    fact = monthly_points.join([monthly_skills, monthly_calendar], how='outer').reset_index()
+    fact['points_sum'] = fact['points_sum'].fillna(0.0)
+    fact['days'] = fact['days'].fillna(0).astype(np.int32)
+    fact['sick_count'] = fact['sick_count'].fillna(0.0)
+    fact['holidays_count'] = fact['holidays_count'].fillna(0.0)
+    fact['month_key'] = fact['month_key'].astype(np.int32)
+    fact['date'] = pd.to_datetime(
+        pd.DataFrame({'year': fact['month_key'] // 100, 'month': fact['month_key'] % 100, 'day': 1})
+    )
+    return EmployeeIndex(fact[FACT_COLUMNS])
+
+
+def update_employee_month(previous, points, skills_mark, calendar, month_keys):
+    """Пересчитывает таблицу сотрудник × месяц только для месяцев month_keys.
+
+    previous - прежняя таблица (EmployeeIndex); points, skills_mark и
+    calendar - актуальные полные таблицы, из них берутся строки только
+    затронутых месяцев. Строки остальных месяцев переносятся как есть.
+    """
+    keys = sorted(month_keys)
+    kept = previous.frame[~previous.frame['month_key'].isin(keys)]
+    fresh = build_employee_month(
+        points[month_key(points['date']).isin(keys)],
+        skills_mark[(skills_mark['year'] * 100 + skills_mark['month']).isin(keys)],
+        calendar[(calendar['year'] * 100 + calendar['month']).isin(keys)],
+    )
+    return EmployeeIndex(pd.concat([kept, fresh.frame], ignore_index=True))
+
+
+def employee_summary(rows):
+    """Итоги по строкам таблицы сотрудник × месяц (за весь период или за месяц).
+
+    Для пустой выборки возвращает нули и NaN, как агрегаты по пустому DataFrame.
+    """
+    days = int(rows['days'].sum())
+    points_sum = float(rows['points_sum'].sum())
+    return {
+        'points_sum': points_sum,
+        'points_mean': points_sum / days if days else np.nan,
+        'points_max': rows['points_max'].max(),
+        'days': days,
+        'sick_count': rows['sick_count'].sum(),
+        'holidays_count': rows['holidays_count'].sum(),
+    }
@@ -0,0 +1,222 @@
+"""Сигналы о падении ежедневных очков сотрудников.
+
+Базовый уровень сотрудника - среднее и стандартное отклонение очков за
+WINDOW предыдущих рабочих дней. Сигнал - день, где z-оценка очков
+относительно базового уровня не выше ALERT_Z. Месяцы, в которых у
+сотрудника есть больничные или отпускные дни, не участвуют ни в базовом
+уровне, ни в сигналах: неполный месяц даёт ложные падения.
+
+Окна считаются векторно для всех сотрудников сразу: по таблице,
+отсортированной по (id_employee, date), строятся накопленные суммы
+очков и их квадратов, а сумма окна - разность двух накопленных сумм, не
+заходящая за первую строку сотрудника. При новой версии данных
+пересчитываются только месяцы, начиная с самого раннего изменённого:
+изменённый месяц находится по хешу его ежедневных строк, так что
+замечаются и правки, не меняющие месячных итогов.
+"""
+
+import threading
+
+import numpy as np
+import pandas as pd
+
+from skills_dashboard import instrumentation
+from skills_dashboard.index import month_slice
+
+# Окно базового уровня и минимум дней в нём, рабочих дней
+WINDOW = 20
+MIN_PERIODS = 10
+# Сигнал - день с z-оценкой не выше порога
+ALERT_Z = -2.0
+
+ALERT_COLUMNS = ['id_employee', 'date', 'month_key', 'points', 'baseline', 'z', 'drop_pct']
+# Колонки, по которым ищутся изменённые месяцы: хеш ежедневных строк и исключающие месяц дни
+CHANGE_COLUMNS = ['points_hash', 'days', 'sick_count', 'holidays_count']
+
+
+def row_months(employee_month):
+    """Ключ месяца и признак исключения для каждой строки ежедневных очков.
+
+    Таблица сотрудник × месяц отсортирована так же, как ежедневные очки,
+    а days - число строк очков в месяце, поэтому значения месяца
+    достаточно повторить days раз: без разбора дат и поиска по ключам.
+    """
+    worked = employee_month[employee_month['days'] > 0]
+    days = worked['days'].to_numpy()
+    excluded = ((worked['sick_count'] > 0) | (worked['holidays_count'] > 0)).to_numpy()
+    return np.repeat(worked['month_key'].to_numpy(), days), np.repeat(excluded, days)
+
+
+def _starts(ids):
+    """Маска первых строк сотрудников в отсортированном массиве id."""
+    starts = np.ones(len(ids), dtype=bool)
+    starts[1:] = ids[1:] != ids[:-1]
+    return starts
+
+
+def window_stats(ids, values, window=WINDOW):
+    """Среднее, стандартное отклонение и число дней в окне предыдущих строк сотрудника.
+
+    Окно строки i - не больше window строк того же сотрудника перед ней;
+    сам день в свой базовый уровень не входит.
+    """
+    positions = np.arange(len(ids))
+    group_start = np.maximum.accumulate(np.where(_starts(ids), positions, 0))
+    count = np.minimum(positions - group_start, window)
+    sums = np.concatenate(([0.0], np.cumsum(values)))
+    squares = np.concatenate(([0.0], np.cumsum(values * values)))
+    total = sums[positions] - sums[positions - count]
+    total_squares = squares[positions] - squares[positions - count]
+    with np.errstate(invalid='ignore', divide='ignore'):
+        mean = total / count
+        variance = (total_squares - total * mean) / (count - 1)
+    # Отрицательная дисперсия - ошибка округления на постоянном ряду
+    return mean, np.sqrt(np.clip(variance, 0, None)), count
+
+
+def detect(points, employee_month, since=None, window=WINDOW, min_periods=MIN_PERIODS, alert_z=ALERT_Z):
+    """Сигналы о падении очков по таблице ежедневных очков.
+
+    points - таблица (id_employee, date, points), отсортированная по
+    (id_employee, date); employee_month - таблица сотрудник × месяц,
+    построенная по тем же очкам.
+    since - ключ месяца YYYYMM: сигналы только с этого месяца, а более
+    ранние строки берутся лишь как окно базового уровня. Возвращает
+    таблицу с колонками ALERT_COLUMNS.
+    """
+    months, excluded = row_months(employee_month)
+    kept = ~excluded
+    ids = points['id_employee'].to_numpy()[kept]
+    dates = points['date'].to_numpy()[kept]
+    months = months[kept]
+    values = points['points'].to_numpy(np.float64)[kept]
+
+    if since is not None and len(ids):
+        # Каждому сотруднику - строки с месяца since и window строк перед ними
+        positions = np.arange(len(ids))
+        starts = _starts(ids)
+        first_new = np.where(months >= since, positions, len(ids) + window)
+        first_new = np.minimum.reduceat(first_new, np.flatnonzero(starts))[np.cumsum(starts) - 1]
+        needed = positions >= first_new - window
+        ids, dates, months, values = ids[needed], dates[needed], months[needed], values[needed]
+
+    mean, std, count = window_stats(ids, values, window)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        z = (values - mean) / std
+    alert = (count >= min_periods) & (std > 0) & (z <= alert_z)
+    if since is not None:
+        alert &= months >= since
+
+    alerts = pd.DataFrame({
+        'id_employee': ids[alert],
+        'date': dates[alert],
+        'month_key': months[alert],
+        'points': values[alert].astype(np.float32),
+        'baseline': mean[alert].astype(np.float32),
+        'z': z[alert].astype(np.float32),
+    })
+    baseline = alerts['baseline'].where(alerts['baseline'] > 0)
+    alerts['drop_pct'] = ((1 - alerts['points'] / baseline) * 100).astype(np.float32)
+    return alerts[ALERT_COLUMNS]
+
+
+def month_changes(points, employee_month):
+    """Таблица для поиска изменённых месяцев: сотрудник × месяц с колонками CHANGE_COLUMNS.
+
+    points_hash - сумма хешей строк (дата, очки) месяца сотрудника: перенос
+    очков между днями меняет её, даже если итоги месяца остались прежними.
+    """
+    rows = pd.util.hash_pandas_object(points[['date', 'points']], index=False).to_numpy()
+    days = employee_month['days'].to_numpy()
+    worked = days > 0
+    hashes = np.zeros(len(employee_month), dtype=np.uint64)
+    if len(rows):
+        # Строки очков идут в порядке таблицы сотрудник × месяц, по days строк на месяц
+        starts = np.concatenate(([0], np.cumsum(days[worked])[:-1]))
+        hashes[worked] = np.add.reduceat(rows, starts)
+    changes = employee_month[['id_employee', 'month_key', 'days', 'sick_count', 'holidays_count']]
+    return changes.assign(points_hash=hashes)
+
+
+def first_changed_month(previous, current):
+    """Самый ранний ключ месяца, где таблицы month_changes различаются; None, если нет."""
+    keys = ['id_employee', 'month_key']
+    merged = previous[[*keys, *CHANGE_COLUMNS]].merge(
+        current[[*keys, *CHANGE_COLUMNS]], on=keys, how='outer', suffixes=('', '_new'), indicator=True
+    )
+    changed = merged['_merge'] != 'both'
+    for column in CHANGE_COLUMNS:
+        old, new = merged[column], merged[f'{column}_new']
+        changed |= old.ne(new) & ~(old.isna() & new.isna())
+    if not changed.any():
+        return None
+    return int(merged.loc[changed, 'month_key'].min())
+
+
+class AlertTable:
+    """Сигналы, отсортированные по (month_key, z): месяц выбирается срезом."""
+
+    def __init__(self, alerts, employees):
+        alerts = alerts.assign(fio_employee=alerts['id_employee'].map(
+            employees.set_index('id_employee')['fio_employee']
+        ))
+        self.frame = alerts.sort_values(['month_key', 'z'], kind='stable', ignore_index=True)
+        self.month_keys = self.frame['month_key'].to_numpy()
+
+    def __len__(self):
+        return len(self.frame)
+
+    def month(self, month):
+        """Сигналы за месяц без копирования, от самых сильных падений."""
+        return month_slice(self.frame, self.month_keys, month)
+
+    def query(self, month, max_z=ALERT_Z, employee_ids=None):
+        """Сигналы за месяц с z не выше max_z, при необходимости по части сотрудников."""
+        alerts = self.month(month)
+        alerts = alerts[alerts['z'] <= max_z]
+        if employee_ids is not None:
+            alerts = alerts[alerts['id_employee'].isin(employee_ids)]
+        return alerts
+
+
+class AlertEngine:
+    """Таблица сигналов для текущей версии данных с пересчётом по изменённым месяцам.
+
+    Хранит сигналы и таблицу month_changes предыдущей версии. Для новой
+    версии сигналы до самого раннего изменённого месяца переиспользуются,
+    остальные считаются заново с окном базового уровня из более ранних дней.
+    """
+
+    def __init__(self):
+        self.version = None
+        self.table = None
+        self._alerts = None
+        self._changes = None
+        self._lock = threading.Lock()
+
+    def alerts(self, version, data):
+        """AlertTable для версии данных version."""
+        with self._lock:
+            if version == self.version:
+                instrumentation.cache_event('alerts', hit=True)
+                return self.table
+            instrumentation.cache_event('alerts', hit=False)
+
+            employee_month = data.employee_month.frame
+            changes = month_changes(data.points.frame, employee_month)
+            if self._alerts is None:
+                alerts = detect(data.points.frame, employee_month)
+            else:
+                since = first_changed_month(self._changes, changes)
+                alerts = self._alerts
+                if since is not None:
+                    kept = alerts[alerts['month_key'] < since]
+                    alerts = pd.concat(
+                        [kept, detect(data.points.frame, employee_month, since)], ignore_index=True
+                    )
+
+            self.version = version
+            self.table = AlertTable(alerts, data.employees)
+            self._alerts = alerts
+            self._changes = changes
+            return self.table
@@ -0,0 +1,140 @@
+"""Сжатие двух выгрузок заданий в одну колоночную партицию на месяц.
+
+employee_daily_tasks_points_YYYY_MM.csv и employee_daily_tasks_points_full_YYYY_MM.csv
+содержат одни и те же задания с почти одинаковыми колонками. Инструмент
+сопоставляет строки пары по (id_employee, date, sap_id), проверяет, что
+общие колонки совпадают, и пишет объединение колонок в
+employee_daily_tasks_points_YYYY_MM.parquet рядом с исходными файлами.
+Загрузчик (ingest.discover) после этого читает из партиции только
+нужные колонки вместо разбора CSV.
+
+    python -m skills_dashboard.compact --workers 4 [--delete-sources]
+"""
+
+import argparse
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from skills_dashboard import ingest
+
+TASKS_PATTERN = 'employee_daily_tasks_points_????_??.csv'
+FULL_FAMILY = 'tasks_full'
+KEY_COLUMNS = ['id_employee', 'date', 'sap_id']
+
+
+def store_path(key, output_dir=ingest.OUTPUT_DIR):
+    return Path(output_dir) / f'employee_daily_tasks_points_{key}.parquet'
+
+
+def match_rows(tasks, full):
+    """Сопоставляет строки двух выгрузок по (id_employee, date, sap_id).
+
+    Ключ не уникален (одно изделие за день встречается несколько раз),
+    поэтому строки с одинаковым ключом сопоставляются по порядку появления.
+    Возвращает (объединённая таблица в порядке строк full, список проблем);
+    таблица годится к записи, только если список пуст.
+    """
+    problems = []
+    shared = [column for column in tasks if column in full and column not in KEY_COLUMNS]
+    extra = [column for column in tasks if column not in full]
+
+    left = full.assign(_occurrence=full.groupby(KEY_COLUMNS).cumcount(), _row=np.arange(len(full)))
+    right = tasks.assign(_occurrence=tasks.groupby(KEY_COLUMNS).cumcount())
+    merged = left.merge(
+        right, on=[*KEY_COLUMNS, '_occurrence'], how='outer', suffixes=('', '_tasks'), indicator=True
+    )
+
+    unmatched = merged['_merge'].value_counts()
+    for side, label in (('left_only', 'только в full'), ('right_only', 'только в tasks')):
+        if unmatched.get(side, 0):
+            problems.append(f'{unmatched[side]} строк {label}')
+
+    both = merged[merged['_merge'] == 'both']
+    for column in shared:
+        ours, theirs = both[column], both[f'{column}_tasks']
+        differ = int((ours.ne(theirs) & ~(ours.isna() & theirs.isna())).sum())
+        if differ:
+            problems.append(f'{column}: {differ} строк различаются')
+
+    union = both.sort_values('_row')[[*full.columns, *extra]].reset_index(drop=True)
+    return union, problems
+
+
+def compact_month(key, tasks_path, full_path, output_dir=ingest.OUTPUT_DIR, delete_sources=False):
+    """Сжимает пару файлов одного месяца; партиция пишется, только если строки совпали.
+
+    Возвращает словарь со статистикой и списком проблем.
+    """
+    tasks = pd.read_csv(tasks_path)
+    full = pd.read_csv(full_path)
+    union, problems = match_rows(tasks, full)
+    stats = {
+        'month': key,
+        'rows': len(full),
+        'columns': union.shape[1],
+        'csv_bytes': tasks_path.stat().st_size + full_path.stat().st_size,
+        'parquet_bytes': None,
+        'problems': problems,
+    }
+    if problems:
+        return stats
+
+    union['date'] = pd.to_datetime(union['date'])
+    for column in union.select_dtypes(include=['object', 'string']).columns:
+        union[column] = union[column].astype('category')
+    target = store_path(key, output_dir)
+    ingest._write_atomic(target, lambda tmp: union.to_parquet(tmp, index=False))
+    stats['parquet_bytes'] = target.stat().st_size
+
+    if delete_sources:
+        tasks_path.unlink()
+        full_path.unlink()
+    return stats
+
+
+def compact(output_dir=ingest.OUTPUT_DIR, workers=None, delete_sources=False):
+    """Сжимает все месяцы, для которых есть обе выгрузки; возвращает таблицу статистики."""
+    full_files = {
+        key: path for key, path in ingest.discover(FULL_FAMILY, output_dir).items() if path.suffix == '.csv'
+    }
+    tasks_files = {ingest.partition_key(path): path for path in sorted(Path(output_dir).glob(TASKS_PATTERN))}
+    keys = sorted(set(full_files) & set(tasks_files))
+
+    jobs = [(key, tasks_files[key], full_files[key], output_dir, delete_sources) for key in keys]
+    if len(jobs) > 1 and workers != 1:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            stats = list(pool.map(compact_month, *zip(*jobs)))
+    else:
+        stats = [compact_month(*job) for job in jobs]
+    return pd.DataFrame(stats, columns=['month', 'rows', 'columns', 'csv_bytes', 'parquet_bytes', 'problems'])
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Сжатие выгрузок заданий в колоночные партиции')
+    parser.add_argument('--output-dir', type=Path, default=ingest.OUTPUT_DIR)
+    parser.add_argument('--workers', type=int, default=os.cpu_count())
+    parser.add_argument(
+        '--delete-sources', action='store_true', help='удалить пару CSV после успешной проверки и записи'
+    )
+    args = parser.parse_args(argv)
+
+    stats = compact(args.output_dir, args.workers, args.delete_sources)
+    failed = stats[stats['problems'].map(len) > 0]
+    for row in failed.itertuples():
+        print(f'{row.month}: строки не совпали, партиция не записана: {"; ".join(row.problems)}')
+    done = stats.drop(failed.index)
+    if len(done):
+        print(
+            f'Сжато месяцев: {len(done)}, строк: {done["rows"].sum()}, '
+            f'CSV {done["csv_bytes"].sum() / 2**20:.2f} MiB -> Parquet {done["parquet_bytes"].sum() / 2**20:.2f} MiB'
+        )
+    return 1 if len(failed) else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
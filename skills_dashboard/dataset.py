@@ -0,0 +1,136 @@
+"""Подготовка данных дашборда без зависимости от Streamlit."""
+
+import os
+
+import pandas as pd
+
+from skills_dashboard import aggregates, dimensions, ingest, instrumentation, verify
+from skills_dashboard.index import EmployeeIndex
+
+EAGER_FAMILIES = ['employee_points_daily', 'skills_mark', 'calendar_sick_holidays']
+
+# Источник ежедневных очков: 'daily' - файлы employee_points_daily_*,
+# 'tasks' - суммы, пересчитанные из заданий (см. verify)
+POINTS_SOURCE = os.environ.get('SKILLS_POINTS_SOURCE', 'daily')
+
+
+class Dataset:
+    """Подготовленные таблицы дашборда.
+
+    points - ежедневные очки, skills - оценки навыков (EmployeeIndex);
+    employees - справочник сотрудников; employee_month - таблица
+    сотрудник × месяц (EmployeeIndex); calendar - больничные и отпуска.
+    Таблицы разделяются между сессиями, изменять их нельзя.
+    """
+
+    def __init__(self, points, skills, employees, employee_month, calendar):
+        self.points = points
+        self.skills = skills
+        self.employees = employees
+        self.employee_month = employee_month
+        self.calendar = calendar
+
+
+def partition_month_key(key):
+    """Ключ месяца YYYYMM для ключа партиции 'YYYY_MM'."""
+    return int(key.replace('_', ''))
+
+
+def with_month_date(df):
+    """Добавляет колонку date (первое число месяца) по колонкам year и month."""
+    return df.assign(date=pd.to_datetime(df[['year', 'month']].assign(day=1)))
+
+
+def build_dataset(employee_points_daily_full, skills_mark_full, calendar_sick_holidays):
+    """Строит Dataset из полных таблиц трёх семейств."""
+    # Справочник сотрудников вместо ФИО в каждой строке фактов
+    employee_name_mapping = dimensions.employee_dimension(skills_mark_full)
+
+    # Создаем колонку с датой для skills_mark (первое число месяца)
+    skills_mark_full = with_month_date(skills_mark_full)
+
+    # Таблица сотрудник × месяц для всех месячных метрик
+    with instrumentation.stage('employee_month'):
+        employee_month = aggregates.build_employee_month(
+            employee_points_daily_full, skills_mark_full, calendar_sick_holidays
+        )
+
+    # Сортируем по (id_employee, date) и строим индексы по сотрудникам
+    with instrumentation.stage('employee_index', rows=len(employee_points_daily_full) + len(skills_mark_full)):
+        points = EmployeeIndex(employee_points_daily_full)
+        skills = EmployeeIndex(skills_mark_full)
+    return Dataset(
+        points=points,
+        skills=skills,
+        employees=employee_name_mapping,
+        employee_month=employee_month,
+        calendar=calendar_sick_holidays,
+    )
+
+
+def load_dataset(output_dir=ingest.OUTPUT_DIR, cache_dir=ingest.CACHE_DIR):
+    """Загружает и подготавливает все таблицы, кроме заданий.
+
+    Задания загружаются по месяцам через TaskStore.
+    """
+    if POINTS_SOURCE == 'tasks':
+        frames = ingest.load_all(output_dir, cache_dir, families=EAGER_FAMILIES[1:])
+        # Без пула процессов: загрузка идёт и внутри сервера, а fork процесса
+        # с потоками tornado, watchdog и Arrow может оставить дочерние процессы в дедлоке
+        with instrumentation.stage('derived_points'):
+            frames['employee_points_daily'] = verify.derived_points(output_dir, cache_dir, workers=1)
+    else:
+        frames = ingest.load_all(output_dir, cache_dir, families=EAGER_FAMILIES)
+    return build_dataset(
+        frames['employee_points_daily'], frames['skills_mark'], frames['calendar_sick_holidays']
+    )
+
+
+def update_dataset(previous, changed, removed):
+    """Новый Dataset после изменения отдельных партиций.
+
+    changed - {семейство: {ключ партиции: DataFrame}} с новыми и изменёнными
+    партициями, removed - {семейство: множество ключей} удалённых. Строки
+    затронутых месяцев заменяются, таблица сотрудник × месяц пересчитывается
+    только для них; незатронутые таблицы переиспользуются без копирования.
+    """
+    months = set()
+    points = previous.points
+    skills = previous.skills
+    employees = previous.employees
+    calendar = previous.calendar
+
+    points_parts = changed.get('employee_points_daily', {})
+    points_keys = {partition_month_key(key) for key in set(points_parts) | removed.get('employee_points_daily', set())}
+    if points_keys:
+        frame = points.frame
+        frame = frame[~aggregates.month_key(frame['date']).isin(points_keys)]
+        frame = pd.concat([frame, *points_parts.values()], ignore_index=True)
+        with instrumentation.stage('employee_index', rows=len(frame)):
+            points = EmployeeIndex(frame)
+        months |= points_keys
+
+    skills_parts = changed.get('skills_mark', {})
+    skills_keys = {partition_month_key(key) for key in set(skills_parts) | removed.get('skills_mark', set())}
+    if skills_keys:
+        frame = skills.frame
+        frame = frame[~(frame['year'] * 100 + frame['month']).isin(skills_keys)]
+        new_parts = [with_month_date(part) for part in skills_parts.values()]
+        frame = pd.concat([frame, *new_parts], ignore_index=True)
+        with instrumentation.stage('employee_index', rows=len(frame)):
+            skills = EmployeeIndex(frame)
+        employees = dimensions.employee_dimension(skills.frame)
+        months |= skills_keys
+
+    # Календарь - один файл на все месяцы: затронуты месяцы старой и новой версии
+    if changed.get('calendar_sick_holidays') or removed.get('calendar_sick_holidays'):
+        new_calendar = next(iter(changed.get('calendar_sick_holidays', {}).values()), calendar.iloc[0:0])
+        for frame in (calendar, new_calendar):
+            months |= set((frame['year'] * 100 + frame['month']).unique().tolist())
+        calendar = new_calendar
+
+    with instrumentation.stage('employee_month', rows=len(months)):
+        employee_month = aggregates.update_employee_month(
+            previous.employee_month, points.frame, skills.frame, calendar, months
+        )
+    return Dataset(points, skills, employees, employee_month, calendar)
@@ -0,0 +1,46 @@
+"""Звёздная схема: справочники сотрудников и изделий и таблица заданий с целыми ключами.
+
+Строковые атрибуты (ФИО, название изделия, участок) хранятся один раз в
+справочниках, а не повторяются в каждой строке фактов.
+"""
+
+import numpy as np
+import pandas as pd
+
+PRODUCT_COLUMNS = ['sap_id', 'sap_name', 'area']
+
+
+def employee_dimension(skills_mark):
+    """Справочник id_employee -> fio_employee (последнее известное непустое ФИО)."""
+    employees = (
+        skills_mark[['id_employee', 'fio_employee']]
+        .dropna(subset=['fio_employee'])
+        .drop_duplicates('id_employee', keep='last')
+        .astype({'fio_employee': object})
+        .sort_values('id_employee', ignore_index=True)
+    )
+    return employees
+
+
+def split_tasks(tasks):
+    """Делит задания на справочник изделий и таблицу фактов.
+
+    Один sap_id встречается с разными названиями и участками (например,
+    sap_id 0 - служебные работы), поэтому ключ изделия - суррогатный
+    product_key по тройке (sap_id, sap_name, area).
+    Возвращает (facts, products); products индексирован по product_key.
+    """
+    grouped = tasks.groupby(PRODUCT_COLUMNS, dropna=False, observed=True, sort=False)
+    codes = grouped.ngroup()
+    products = grouped.size().index.to_frame(index=False)
+    products = products.astype({'sap_name': object, 'area': object})
+    products.index = pd.RangeIndex(len(products), name='product_key')
+
+    facts = tasks.drop(columns=PRODUCT_COLUMNS)
+    facts['product_key'] = codes.astype(np.int32)
+    return facts, products
+
+
+def with_products(facts, products):
+    """Добавляет атрибуты изделий к (небольшому) срезу фактов."""
+    return facts.join(products, on='product_key')
@@ -0,0 +1,58 @@
+"""Прореживание длинных рядов методом LTTB (Largest-Triangle-Three-Buckets).
+
+LTTB сохраняет форму ряда: из каждой корзины берётся точка, образующая
+наибольший треугольник с уже выбранной точкой и средним следующей корзины,
+поэтому пики и провалы не теряются.
+"""
+
+import numpy as np
+
+
+def lttb_indices(x, y, threshold):
+    """Индексы точек, оставляемых LTTB; x - числа по возрастанию.
+
+    Если точек не больше threshold, возвращаются все индексы.
+    """
+    n = len(x)
+    if threshold >= n or threshold < 3:
+        return np.arange(n)
+
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+
+    # Границы корзин для внутренних точек: первая и последняя точки сохраняются всегда
+    edges = np.linspace(1, n - 1, threshold - 1).astype(np.int64)
+    selected = np.empty(threshold, dtype=np.int64)
+    selected[0] = 0
+    selected[-1] = n - 1
+
+    previous = 0
+    for i in range(threshold - 2):
+        start, end = edges[i], edges[i + 1]
+        next_start, next_end = edges[i + 1], edges[i + 2] if i + 2 < len(edges) else n
+        next_x = x[next_start:next_end].mean()
+        next_y = y[next_start:next_end].mean()
+
+        # Удвоенная площадь треугольника (предыдущая точка, кандидат, среднее следующей корзины)
+        area = np.abs(
+            (x[previous] - next_x) * (y[start:end] - y[previous])
+            - (x[previous] - x[start:end]) * (next_y - y[previous])
+        )
+        previous = start + int(np.argmax(area))
+        selected[i + 1] = previous
+
+    return selected
+
+
+def lttb(frame, x_column, y_column, threshold):
+    """Прореживает таблицу по ряду (x_column, y_column) до threshold строк.
+
+    Даты в x_column переводятся в числа; строки с NaN в y не участвуют.
+    """
+    if len(frame) <= threshold:
+        return frame
+    frame = frame[frame[y_column].notna()]
+    x = frame[x_column].to_numpy()
+    if np.issubdtype(x.dtype, np.datetime64):
+        x = x.astype('datetime64[ns]').astype(np.int64)
+    return frame.iloc[lttb_indices(x, frame[y_column].to_numpy(), threshold)]
@@ -0,0 +1,207 @@
+"""Пакетная выгрузка месячных отчётов по сотрудникам.
+
+Для каждого сотрудника за выбранный месяц пишутся те же данные, что
+показывает визуализация «Ежедневные очки (фильтр по месяцу)»: график
+ежедневных очков, итоги месяца с больничными и отпускными днями и топ
+изделий - в HTML, PNG и CSV. Родительский процесс готовит общий снимок
+таблиц (как сервер дашборда), рабочие процессы пула открывают его через
+memory map и обрабатывают сотрудников пачками.
+
+    python main.py --month 2025-06 --formats html csv --workers 8
+    python main.py --month 2025-06 --area 'Участок 1' --employees 101 102
+"""
+
+import argparse
+import html
+import importlib.util
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import pandas as pd
+from plotly.offline import get_plotlyjs
+
+from skills_dashboard import figures, ingest, snapshot, views
+from skills_dashboard.index import period_to_key
+from skills_dashboard.task_store import TaskStore, employee_areas
+
+FORMATS = ['html', 'png', 'csv']
+EXPORT_DIR = Path('exports')
+
+# Итоги месяца: ключ employee_summary -> (подпись, формат), как плитки дашборда
+SUMMARY_LABELS = {
+    'points_sum': ("Общее количество очков", '{:.0f}'),
+    'points_mean': ("Средние очки", '{:.2f}'),
+    'points_max': ("Максимальные очки", '{:.0f}'),
+    'days': ("Количество дней", '{}'),
+    'sick_count': ("Больничные дни", '{:.0f}'),
+    'holidays_count': ("Отпускные дни", '{:.0f}'),
+}
+SUMMARY_COLUMNS = ['id_employee', 'fio_employee', 'area', *SUMMARY_LABELS]
+# Колонки {id}_products.csv, в том числе для сотрудника без заданий
+PRODUCT_COLUMNS = ['sap_id', 'sap_name', 'points']
+
+HTML_TEMPLATE = """<!DOCTYPE html>
+<html lang="ru">
+<head>
+<meta charset="utf-8">
+<title>{title}</title>
+<script src="plotly.min.js"></script>
+</head>
+<body>
+<h1>{title}</h1>
+{summary}
+{charts}
+</body>
+</html>
+"""
+
+# Состояние рабочего процесса: снимок таблиц и кеш заданий открываются один раз
+_worker = {}
+
+
+def month_dir(target_dir, month):
+    """Каталог отчётов месяца: target_dir/YYYY_MM."""
+    period = pd.Period(month, freq='M')
+    return Path(target_dir) / f'{period.year:04d}_{period.month:02d}'
+
+
+def month_employees(data, month):
+    """id сотрудников с ежедневными очками за month и известным ФИО.
+
+    Как в списке сотрудников дашборда: без дней с очками отчёт состоит из
+    пустых графиков и NaN в итогах.
+    """
+    frame = data.employee_month.frame
+    rows = frame[(frame['month_key'] == period_to_key(month)) & (frame['days'] > 0)]
+    named = data.employees.dropna(subset=['fio_employee'])['id_employee']
+    return sorted(rows.loc[rows['id_employee'].isin(named), 'id_employee'].tolist())
+
+
+def _init_worker(version, month, target, formats, output_dir, cache_dir):
+    _worker.update(
+        data=snapshot.open_snapshot(version, cache_dir),
+        task_store=TaskStore(output_dir=output_dir, cache_dir=cache_dir),
+        month=month,
+        target=target,
+        formats=formats,
+    )
+
+
+def _export_chunk(employees):
+    """Выгружает отчёты пачки сотрудников [(id, ФИО, участок)]; возвращает строки итогов."""
+    return [export_employee(*employee, **_worker) for employee in employees]
+
+
+def export_employee(employee_id, employee_name, area, data, task_store, month, target, formats):
+    """Пишет отчёты одного сотрудника в каталог target; возвращает итоги месяца."""
+    points, summary = views.month_daily_points(data, employee_id, month)
+    _, grouped = views.month_task_detail(task_store, employee_id, month)
+    title = f'{employee_id} - {employee_name}'
+
+    charts = [figures.daily_points_figure(
+        points, employee_id, employee_name,
+        title=f'Ежедневные очки за {month}: {title}', color='#d62728',
+    )]
+    if len(grouped):
+        charts.append(figures.top_products_figure(grouped, month))
+
+    stem = target / str(employee_id)
+    if 'csv' in formats:
+        points[['date', 'points']].to_csv(f'{stem}_daily.csv', index=False)
+        grouped.reindex(columns=PRODUCT_COLUMNS).to_csv(f'{stem}_products.csv', index=False)
+    if 'png' in formats:
+        for suffix, fig in zip(['', '_products'], charts):
+            fig.write_image(f'{stem}{suffix}.png')
+    if 'html' in formats:
+        tiles = ''.join(
+            f'<tr><th>{label}</th><td>{fmt.format(summary[key])}</td></tr>'
+            for key, (label, fmt) in SUMMARY_LABELS.items()
+        )
+        Path(f'{stem}.html').write_text(HTML_TEMPLATE.format(
+            title=html.escape(f'Отчёт за {month}: {title}'),
+            summary=f'<table>{tiles}</table>',
+            charts='\n'.join(fig.to_html(full_html=False, include_plotlyjs=False) for fig in charts),
+        ), encoding='utf-8')
+
+    return {'id_employee': employee_id, 'fio_employee': employee_name, 'area': area, **summary}
+
+
+def export(month, formats=('html', 'csv'), employee_ids=None, area=None, target_dir=EXPORT_DIR,
+           output_dir=ingest.OUTPUT_DIR, cache_dir=ingest.CACHE_DIR, workers=None):
+    """Выгружает отчёты за month по всем сотрудникам месяца или их подмножеству.
+
+    employee_ids и area сужают выборку. Отчёты пишутся в target_dir/YYYY_MM,
+    туда же - summary.csv с итогами по всем выгруженным сотрудникам.
+    Возвращает таблицу итогов.
+    """
+    month = str(pd.Period(month, freq='M'))
+    version = ingest.data_version(output_dir)
+    data = snapshot.load_or_build(version, output_dir, cache_dir)
+
+    employees = month_employees(data, month)
+    if employee_ids is not None:
+        wanted = set(employee_ids)
+        employees = [employee_id for employee_id in employees if employee_id in wanted]
+    areas = employee_areas(output_dir, cache_dir)
+    if area is not None:
+        employees = [employee_id for employee_id in employees if areas.get(employee_id) == area]
+    names = data.employees.set_index('id_employee')['fio_employee']
+    jobs = [(employee_id, names.get(employee_id, ''), areas.get(employee_id)) for employee_id in employees]
+
+    target = month_dir(target_dir, month)
+    target.mkdir(parents=True, exist_ok=True)
+    if 'html' in formats:
+        # Одна копия plotly.js на каталог вместо 4 МБ в каждом отчёте
+        (target / 'plotly.min.js').write_text(get_plotlyjs(), encoding='utf-8')
+
+    setup = (version, month, target, tuple(formats), output_dir, cache_dir)
+    if len(jobs) > 1 and workers != 1:
+        workers = workers or os.cpu_count()
+        # Несколько пачек на процесс, чтобы медленные сотрудники не держали весь пул
+        size = max(1, -(-len(jobs) // (workers * 4)))
+        chunks = [jobs[start:start + size] for start in range(0, len(jobs), size)]
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=setup) as pool:
+            rows = [row for chunk in pool.map(_export_chunk, chunks) for row in chunk]
+    else:
+        _init_worker(*setup)
+        rows = _export_chunk(jobs)
+
+    summary = pd.DataFrame(rows, columns=SUMMARY_COLUMNS)
+    summary.to_csv(target / 'summary.csv', index=False)
+    return summary
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Пакетная выгрузка месячных отчётов по сотрудникам')
+    parser.add_argument('--month', required=True, help='месяц в формате YYYY-MM')
+    parser.add_argument('--formats', nargs='+', choices=FORMATS, default=['html', 'csv'])
+    parser.add_argument('--employees', nargs='+', type=int, help='только эти id сотрудников')
+    parser.add_argument('--area', help='только сотрудники основного участка')
+    parser.add_argument('--target-dir', type=Path, default=EXPORT_DIR)
+    parser.add_argument('--output-dir', type=Path, default=ingest.OUTPUT_DIR)
+    parser.add_argument('--cache-dir', type=Path, default=ingest.CACHE_DIR)
+    parser.add_argument('--workers', type=int, default=os.cpu_count())
+    args = parser.parse_args(argv)
+    if 'png' in args.formats and importlib.util.find_spec('kaleido') is None:
+        parser.error('для PNG нужен пакет kaleido (pip install kaleido)')
+
+    started = time.perf_counter()
+    summary = export(
+        args.month, args.formats, args.employees, args.area, args.target_dir,
+        args.output_dir, args.cache_dir, args.workers,
+    )
+    if summary.empty:
+        print(f'За {args.month} нет сотрудников для выгрузки')
+        return 1
+    print(
+        f'Выгружено сотрудников: {len(summary)} за {time.perf_counter() - started:.1f} с '
+        f'в {month_dir(args.target_dir, args.month)}'
+    )
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
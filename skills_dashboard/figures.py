@@ -0,0 +1,146 @@
+"""Построение графиков Plotly для визуализаций дашборда.
+
+plotly.express импортируется внутри функции, которой он нужен: импорт
+занимает ~150 мс и не нужен визуализациям без столбчатого графика.
+"""
+
+import plotly.graph_objects as go
+
+from skills_dashboard.downsample import lttb
+
+# Ряды длиннее порога прореживаются на сервере (LTTB)
+DOWNSAMPLE_THRESHOLD = 2000
+# Ряды длиннее порога рисуются через WebGL (Scattergl)
+WEBGL_THRESHOLD = 1000
+
+
+def employee_line_figure(x, y, employee_id, employee_name, title, xaxis_title, yaxis_title,
+                         hover_x, hover_y, color, line_width=3, marker_size=6):
+    """Линейный график показателя одного сотрудника.
+
+    hover_x и hover_y - подписи в подсказке, например 'Дата: %{x}' и
+    'Очки: %{y}'. Длинные ряды рисуются через Scattergl.
+    """
+    fig = go.Figure()
+
+    trace = go.Scattergl if len(x) > WEBGL_THRESHOLD else go.Scatter
+    fig.add_trace(trace(
+        x=x,
+        y=y,
+        mode='lines+markers',
+        name=f"ID: {employee_id}",
+        line=dict(width=line_width, color=color),
+        marker=dict(size=marker_size),
+        hovertemplate=f'<b>ID: {employee_id}</b><br>' +
+                     f'<b>Имя: {employee_name}</b><br>' +
+                     f'{hover_x}<br>' +
+                     f'{hover_y}<br>' +
+                     '<extra></extra>'
+    ))
+
+    fig.update_layout(
+        title=title,
+        xaxis_title=xaxis_title,
+        yaxis_title=yaxis_title,
+        width=1200,
+        height=600,
+        hovermode='x unified'
+    )
+    return fig
+
+
+def daily_points_figure(points, employee_id, employee_name, title, color, max_points=DOWNSAMPLE_THRESHOLD):
+    """Ежедневные очки сотрудника; ряд длиннее max_points прореживается LTTB."""
+    points = lttb(points, 'date', 'points', max_points)
+    return employee_line_figure(
+        points['date'], points['points'], employee_id, employee_name, title,
+        xaxis_title='Дата', yaxis_title='Количество очков',
+        hover_x='Дата: %{x}', hover_y='Очки: %{y}', color=color,
+    )
+
+
+def monthly_average_figure(months, employee_id, employee_name, title):
+    """Средние очки сотрудника по месяцам."""
+    return employee_line_figure(
+        months['date'], months['points_mean'], employee_id, employee_name, title,
+        xaxis_title='Месяц', yaxis_title='Средние очки за месяц',
+        hover_x='Месяц: %{x}', hover_y='Средние очки: %{y:.2f}', color='#ff7f0e',
+        line_width=4, marker_size=10,
+    )
+
+
+def skills_figure(months, employee_id, employee_name, title):
+    """Динамика Skills Mark сотрудника."""
+    return employee_line_figure(
+        months['date'], months['skills_mark'], employee_id, employee_name, title,
+        xaxis_title='Месяц', yaxis_title='Skills Mark',
+        hover_x='Месяц: %{x}', hover_y='Skills Mark: %{y}', color='#2ca02c',
+        line_width=4, marker_size=10,
+    )
+
+
+def top_products_figure(grouped_for_chart, month):
+    """Топ-10 изделий по общим очкам за месяц.
+
+    График как у px.bar, но собран из go.Bar напрямую: px.bar строится
+    в ~15 раз дольше, что заметно при пакетной выгрузке отчётов.
+    """
+    top = grouped_for_chart.head(10)
+    return go.Figure(
+        go.Bar(
+            x=top['sap_name'], y=top['points'],
+            marker_color='#636efa', showlegend=False,
+            hovertemplate='Название изделия=%{x}<br>Очки=%{y}<extra></extra>',
+        ),
+        layout={
+            'title': f'Топ-10 изделий по общим очкам за {month}',
+            'xaxis': {'title': 'Название изделия', 'tickangle': 45},
+            'yaxis': {'title': 'Очки'},
+            'barmode': 'relative',
+        },
+    )
+
+
+def product_top_figure(top, metric, title, yaxis_title):
+    """Топ изделий по показателю metric; изделие подписано SAP ID и названием."""
+    import plotly.express as px
+
+    chart_data = top.assign(product=top['sap_id'].astype(str) + ' - ' + top['sap_name'].astype(str))
+    fig = px.bar(
+        chart_data,
+        x='product',
+        y=metric,
+        title=title,
+        labels={'product': 'Изделие', metric: yaxis_title},
+        hover_data={'employees': True, 'tasks': True},
+    )
+    fig.update_xaxes(tickangle=45, type='category')
+    return fig
+
+
+def comparison_figure(dates, series, labels, title, yaxis_title):
+    """Наложение рядов нескольких сотрудников: одна линия на строку series."""
+    trace = go.Scattergl if series.size > WEBGL_THRESHOLD else go.Scatter
+    fig = go.Figure()
+    for label, values in zip(labels, series):
+        fig.add_trace(trace(
+            x=dates,
+            y=values,
+            mode='lines',
+            name=label,
+            line=dict(width=2),
+            hovertemplate=f'<b>{label}</b><br>' +
+                         'Дата: %{x}<br>' +
+                         'Значение: %{y:.2f}<br>' +
+                         '<extra></extra>'
+        ))
+
+    fig.update_layout(
+        title=title,
+        xaxis_title='Дата',
+        yaxis_title=yaxis_title,
+        width=1200,
+        height=600,
+        hovermode='closest'
+    )
+    return fig
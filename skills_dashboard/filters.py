@@ -0,0 +1,42 @@
+"""Списки для фильтров боковой панели, подготовленные один раз на версию данных.
+
+Модуль не зависит от Streamlit. Дашборд кеширует FilterOptions по версии
+данных, и перезапуск скрипта берёт готовые списки и подписи вместо
+сортировки справочника сотрудников и разбора дат всех строк очков.
+Selectbox сотрудника хранит id, подпись «id - ФИО» строится по словарю,
+поэтому выбранный id не нужно извлекать из строки.
+"""
+
+import numpy as np
+import pandas as pd
+
+
+class FilterOptions:
+    """Сотрудники и месяцы для фильтров и периоды данных для футера.
+
+    employee_ids - id сотрудников с ежедневными очками и известным ФИО по
+    возрастанию; names и labels - id -> ФИО и id -> «id - ФИО»;
+    months - месяцы с ежедневными очками ('YYYY-MM') по возрастанию.
+    """
+
+    def __init__(self, data):
+        employees = data.employees[data.employees['id_employee'].isin(list(data.points.offsets))]
+        employees = employees.dropna(subset=['fio_employee']).sort_values('id_employee')
+        self.names = dict(zip(employees['id_employee'].tolist(), employees['fio_employee'].tolist()))
+        self.labels = {employee_id: f"{employee_id} - {name}" for employee_id, name in self.names.items()}
+        self.employee_ids = list(self.names)
+
+        # Месяцы берутся из таблицы сотрудник × месяц, а не из дат всех строк
+        months = data.employee_month.frame
+        keys = np.unique(months.loc[months['days'] > 0, 'month_key'].to_numpy())
+        self.months = [f"{key // 100:04d}-{key % 100:02d}" for key in keys.tolist()]
+
+        self.points_period = (pd.Timestamp(data.points.dates.min()), pd.Timestamp(data.points.dates.max()))
+        self.skills_period = (pd.Timestamp(data.skills.dates.min()), pd.Timestamp(data.skills.dates.max()))
+
+    def label(self, employee_id):
+        """Подпись сотрудника для selectbox: «id - ФИО»."""
+        return self.labels.get(employee_id, f"{employee_id} - Неизвестно")
+
+    def name(self, employee_id):
+        return self.names.get(employee_id, "Неизвестно")
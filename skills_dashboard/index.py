@@ -0,0 +1,75 @@
+"""Индекс по сотрудникам для таблиц, отсортированных по (id_employee, date).
+
+Таблица сортируется и индексируется один раз при загрузке: для каждого
+сотрудника хранится диапазон строк [start, end), а внутри диапазона даты
+ищутся через searchsorted. Выборка по сотруднику или сотруднику и месяцу
+возвращает срез без копирования за время, пропорциональное числу его строк.
+
+offsets и month_slice - те же приёмы для других отсортированных таблиц
+(изделия, рейтинг, сигналы).
+"""
+
+import numpy as np
+import pandas as pd
+
+
+def period_to_key(month):
+    """Ключ YYYYMM для pd.Period, Timestamp или строки 'YYYY-MM'."""
+    period = pd.Period(month, freq='M')
+    return period.year * 100 + period.month
+
+
+def offsets(ids):
+    """Таблица смещений id -> (start, end) для отсортированного массива id."""
+    boundaries = np.flatnonzero(ids[1:] != ids[:-1]) + 1
+    starts = np.concatenate(([0], boundaries)) if len(ids) else boundaries
+    ends = np.concatenate((boundaries, [len(ids)])) if len(ids) else boundaries
+    return dict(zip(ids[starts].tolist(), zip(starts.tolist(), ends.tolist())))
+
+
+def month_slice(frame, keys, month):
+    """Строки таблицы за месяц без копирования.
+
+    Таблица отсортирована по ключу месяца YYYYMM, keys - массив этих ключей.
+    """
+    key = period_to_key(month)
+    lo = np.searchsorted(keys, key, side='left')
+    hi = np.searchsorted(keys, key, side='right')
+    return frame.iloc[lo:hi]
+
+
+class EmployeeIndex:
+    """Таблица, отсортированная по (id_employee, date), с таблицей смещений."""
+
+    def __init__(self, frame, date_column='date', sort=True):
+        # sort=False - таблица уже отсортирована (например, открыта из снимка)
+        if sort:
+            frame = frame.sort_values(['id_employee', date_column], kind='stable', ignore_index=True)
+        self.frame = frame
+        self.dates = self.frame[date_column].to_numpy()
+        self.offsets = offsets(self.frame['id_employee'].to_numpy())
+
+    def __len__(self):
+        return len(self.frame)
+
+    def bounds(self, employee_id):
+        """Диапазон строк сотрудника; (0, 0), если сотрудника нет."""
+        return self.offsets.get(employee_id, (0, 0))
+
+    def employee(self, employee_id):
+        """Все строки сотрудника."""
+        start, end = self.bounds(employee_id)
+        return self.frame.iloc[start:end]
+
+    def between(self, employee_id, date_from, date_to):
+        """Строки сотрудника с датой в полуинтервале [date_from, date_to)."""
+        start, end = self.bounds(employee_id)
+        dates = self.dates[start:end]
+        lo = start + np.searchsorted(dates, pd.Timestamp(date_from).to_datetime64(), side='left')
+        hi = start + np.searchsorted(dates, pd.Timestamp(date_to).to_datetime64(), side='left')
+        return self.frame.iloc[lo:hi]
+
+    def month(self, employee_id, month):
+        """Строки сотрудника за месяц (pd.Period, Timestamp или строка 'YYYY-MM')."""
+        period = pd.Period(month, freq='M')
+        return self.between(employee_id, period.start_time, (period + 1).start_time)
@@ -0,0 +1,298 @@
+"""Инкрементальная загрузка месячных файлов из output/.
+
+Файлы находятся по маске, их состояние (путь, размер, mtime, sha256)
+хранится в манифесте. Заново разбираются только новые или изменённые
+месяцы, остальные читаются из готовых Parquet-партиций на диске.
+"""
+
+import hashlib
+import json
+import os
+import re
+import tempfile
+import threading
+from pathlib import Path
+
+import pandas as pd
+
+from skills_dashboard import instrumentation
+
+OUTPUT_DIR = Path('output')
+CACHE_DIR = Path('.cache')
+
+# Синхронизация партиций и запись манифеста из потоков одного процесса:
+# загрузить манифест, обновить партиции и сохранить его - только под блокировкой,
+# иначе потоки затирают записи друг друга
+SYNC_LOCK = threading.RLock()
+
+# Семейства файлов: маска поиска, читаемые колонки и их компактные типы.
+# Колонки, которых нет в usecols, дашборд не использует и не читает.
+FAMILIES = {
+    'employee_points_daily': {
+        'pattern': 'employee_points_daily_????_??.csv',
+        'usecols': ['id_employee', 'date', 'points'],
+        'dtype': {'id_employee': 'int32', 'points': 'float32'},
+        'date_columns': ['date'],
+    },
+    'skills_mark': {
+        'pattern': 'rating_linear_col9_????_??.csv',
+        'usecols': ['year', 'month', 'id_employee', 'fio_employee', 'skills_mark'],
+        'dtype': {'year': 'int32', 'month': 'int8', 'id_employee': 'int32', 'skills_mark': 'float32'},
+        'date_columns': [],
+    },
+    'tasks_full': {
+        'pattern': 'employee_daily_tasks_points_full_????_??.csv',
+        # Месяц, сжатый в одну колоночную партицию (см. compact), заменяет CSV
+        'store_pattern': 'employee_daily_tasks_points_????_??.parquet',
+        'usecols': [
+            'id_employee', 'date', 'area', 'sap_id', 'sap_name',
+            'units_made', 'norma_product_adjusted_with_discounts', 'points',
+        ],
+        'dtype': {
+            'id_employee': 'int32',
+            'sap_id': 'int32',
+            'area': 'category',
+            'sap_name': 'category',
+            'units_made': 'float32',
+            'norma_product_adjusted_with_discounts': 'float32',
+            'points': 'float32',
+        },
+        'date_columns': ['date'],
+    },
+    'calendar_sick_holidays': {
+        'pattern': 'calendar_sick_holidays.csv',
+        'usecols': ['year', 'month', 'id_employee', 'sick_count', 'holidays_count'],
+        'dtype': {
+            'year': 'int32',
+            'month': 'int8',
+            'id_employee': 'int32',
+            'sick_count': 'float32',
+            'holidays_count': 'float32',
+        },
+        'date_columns': [],
+    },
+}
+
+MONTH_RE = re.compile(r'_(\d{4})_(\d{2})\.(csv|parquet)$')
+
+
+def partition_key(path):
+    """Ключ партиции: 'YYYY_MM' для месячных файлов, иначе имя файла."""
+    match = MONTH_RE.search(path.name)
+    if match:
+        return f'{match.group(1)}_{match.group(2)}'
+    return path.stem
+
+
+def discover(family, output_dir=OUTPUT_DIR):
+    """Возвращает {ключ партиции: путь} для всех файлов семейства.
+
+    Если месяц уже сжат в колоночную партицию, вместо CSV возвращается она.
+    """
+    spec = FAMILIES[family]
+    files = {partition_key(path): path for path in sorted(Path(output_dir).glob(spec['pattern']))}
+    if 'store_pattern' in spec:
+        files.update((partition_key(path), path) for path in Path(output_dir).glob(spec['store_pattern']))
+    return dict(sorted(files.items()))
+
+
+def file_states(output_dir=OUTPUT_DIR):
+    """{(семейство, ключ): (путь, размер, mtime_ns)} для всех файлов output/."""
+    states = {}
+    for family in FAMILIES:
+        for key, path in discover(family, output_dir).items():
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                # Файл удалили между поиском и stat()
+                continue
+            states[family, key] = (path, stat.st_size, stat.st_mtime_ns)
+    return states
+
+
+def data_version(output_dir=OUTPUT_DIR, states=None):
+    """Дешёвая сигнатура данных по stat() всех файлов, без чтения содержимого."""
+    if states is None:
+        states = file_states(output_dir)
+    digest = hashlib.sha1()
+    for (family, key), (_, size, mtime_ns) in sorted(states.items()):
+        digest.update(f'{family}:{key}:{size}:{mtime_ns};'.encode())
+    return digest.hexdigest()
+
+
+def schema_signature(family):
+    """Сигнатура схемы семейства: при её изменении партиции разбираются заново."""
+    spec = json.dumps(FAMILIES[family], sort_keys=True)
+    return hashlib.sha1(spec.encode()).hexdigest()[:12]
+
+
+def file_hash(path):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _write_atomic(path, write):
+    """Пишет файл через временный и os.replace, чтобы параллельные процессы не видели половину.
+
+    Временный файл получает уникальное имя: в один путь могут писать и
+    несколько процессов, и несколько потоков одного процесса.
+    """
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=f'{path.name}.', suffix='.tmp')
+    os.close(fd)
+    tmp = Path(tmp)
+    try:
+        write(tmp)
+        os.replace(tmp, path)
+    except BaseException:
+        tmp.unlink(missing_ok=True)
+        raise
+
+
+class Manifest:
+    """Манифест файлов output/ и соответствующих им Parquet-партиций."""
+
+    def __init__(self, cache_dir=CACHE_DIR):
+        self.cache_dir = Path(cache_dir)
+        self.path = self.cache_dir / 'manifest.json'
+        try:
+            self.entries = json.loads(self.path.read_text(encoding='utf-8'))
+        except (FileNotFoundError, json.JSONDecodeError):
+            self.entries = {}
+        self._saved = self._dump()
+
+    def partition_path(self, family, key):
+        return self.cache_dir / 'partitions' / family / f'{key}.parquet'
+
+    def _dump(self):
+        return json.dumps(self.entries, ensure_ascii=False, indent=1, sort_keys=True)
+
+    def save(self):
+        """Сохраняет манифест, если он изменился с момента чтения."""
+        payload = self._dump()
+        if payload == self._saved:
+            return
+        _write_atomic(self.path, lambda tmp: tmp.write_text(payload, encoding='utf-8'))
+        self._saved = payload
+
+
+def read_source(path, columns=None, dtype=None):
+    """Читает исходный файл (CSV или сжатую Parquet-партицию), при необходимости только columns."""
+    if Path(path).suffix == '.parquet':
+        df = pd.read_parquet(path, columns=columns)
+        return df.astype(dtype) if dtype else df
+    return pd.read_csv(path, usecols=columns, dtype=dtype)
+
+
+def parse_file(family, path):
+    """Разбирает один файл семейства в DataFrame."""
+    spec = FAMILIES[family]
+    df = read_source(path, spec['usecols'], spec['dtype'])
+    for column in spec['date_columns']:
+        df[column] = pd.to_datetime(df[column])
+    return df
+
+
+def sync_partition(family, key, path, manifest):
+    """Обновляет одну партицию, если файл новый или изменился.
+
+    Возвращает True, если CSV был разобран заново.
+    """
+    entries = manifest.entries.setdefault(family, {})
+    schema = schema_signature(family)
+    stat = path.stat()
+    entry = entries.get(key)
+    partition = manifest.partition_path(family, key)
+
+    if entry is not None and entry.get('schema') == schema and partition.exists():
+        if entry['size'] == stat.st_size and entry['mtime_ns'] == stat.st_mtime_ns:
+            return False
+        # mtime поменялся (например, файл перезаписан тем же содержимым) - сверяем хеш
+        sha256 = file_hash(path)
+        if entry['sha256'] == sha256:
+            entry.update(size=stat.st_size, mtime_ns=stat.st_mtime_ns)
+            return False
+    else:
+        sha256 = file_hash(path)
+
+    df = parse_file(family, path)
+    _write_atomic(partition, lambda tmp: df.to_parquet(tmp, index=False))
+    entries[key] = {
+        'path': str(path),
+        'size': stat.st_size,
+        'mtime_ns': stat.st_mtime_ns,
+        'sha256': sha256,
+        'rows': len(df),
+        'schema': schema,
+    }
+    return True
+
+
+def drop_partition(family, key, manifest):
+    """Удаляет партицию удалённого файла и её запись в манифесте."""
+    manifest.partition_path(family, key).unlink(missing_ok=True)
+    manifest.entries.get(family, {}).pop(key, None)
+
+
+def sync_family(family, manifest, output_dir=OUTPUT_DIR):
+    """Приводит партиции семейства в соответствие с output/.
+
+    Возвращает ({ключ: путь к партиции}, список заново разобранных ключей).
+    """
+    files = discover(family, output_dir)
+    entries = manifest.entries.setdefault(family, {})
+
+    with instrumentation.stage(f'sync_{family}') as stage:
+        # Удалённые файлы убираем из манифеста
+        for key in set(entries) - set(files):
+            drop_partition(family, key, manifest)
+
+        parsed = [key for key, path in files.items() if sync_partition(family, key, path, manifest)]
+        stage['rows'] = len(parsed)
+    return {key: manifest.partition_path(family, key) for key in files}, parsed
+
+
+def load_partition(family, key, output_dir=OUTPUT_DIR, cache_dir=CACHE_DIR):
+    """Загружает одну партицию семейства; None, если такого файла нет."""
+    path = discover(family, output_dir).get(key)
+    if path is None:
+        return None
+    with SYNC_LOCK:
+        manifest = Manifest(cache_dir)
+        sync_partition(family, key, path, manifest)
+        manifest.save()
+    return pd.read_parquet(manifest.partition_path(family, key))
+
+
+def load_family(family, output_dir=OUTPUT_DIR, cache_dir=CACHE_DIR, columns=None):
+    """Загружает все партиции семейства (при необходимости только columns) одной таблицей."""
+    with SYNC_LOCK:
+        manifest = Manifest(cache_dir)
+        partitions, _ = sync_family(family, manifest, output_dir)
+        manifest.save()
+    return read_partitions(family, partitions.values(), columns=columns)
+
+
+def read_partitions(family, paths, columns=None):
+    """Читает партиции семейства (при необходимости только columns) одной таблицей."""
+    with instrumentation.stage(f'read_{family}') as stage:
+        frames = [pd.read_parquet(path, columns=columns) for path in paths]
+        df = pd.concat(frames, ignore_index=True)
+        # У партиций разные наборы категорий, после concat такие колонки становятся строковыми
+        for column, dtype in FAMILIES[family]['dtype'].items():
+            if dtype == 'category' and column in df and df[column].dtype != 'category':
+                df[column] = df[column].astype('category')
+        stage['rows'] = len(df)
+    return df
+
+
+def load_all(output_dir=OUTPUT_DIR, cache_dir=CACHE_DIR, families=None):
+    """Синхронизирует семейства (по умолчанию все) и возвращает {семейство: DataFrame}."""
+    with SYNC_LOCK:
+        manifest = Manifest(cache_dir)
+        partitions = {family: sync_family(family, manifest, output_dir)[0] for family in families or FAMILIES}
+        manifest.save()
+    return {family: read_partitions(family, paths.values()) for family, paths in partitions.items()}
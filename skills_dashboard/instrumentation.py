@@ -0,0 +1,172 @@
+"""Замеры этапов перезапуска скрипта и попаданий в кеши.
+
+На каждый перезапуск создаётся Profiler: он замеряет именованные этапы
+(время и число обработанных строк) и считает попадания и промахи кешей.
+Итог пишется строкой JSON в журнал, по которому считаются перцентили
+задержек по визуализациям. Загрузка данных отмечает свои этапы (разбор
+партиций, чтение, таблица сотрудник × месяц, сортировка индексов) через
+stage(): в журнале они стоят перед охватывающим этапом data_store.
+Фоновое обновление данных пишется отдельной записью с view = 'refresh':
+
+    python -m skills_dashboard.instrumentation logs/timings.jsonl
+"""
+
+import contextvars
+import json
+import os
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from pathlib import Path
+
+import pandas as pd
+
+# Путь к журналу; пустая строка отключает запись
+LOG_PATH = os.environ.get('SKILLS_TIMINGS_LOG', 'logs/timings.jsonl')
+
+_current = contextvars.ContextVar('skills_profiler', default=None)
+_log_lock = threading.Lock()
+
+
+class Profiler:
+    """Замеры одного перезапуска скрипта."""
+
+    def __init__(self, view=None, session=None):
+        self.view = view
+        self.session = session
+        self.stages = []
+        self.cache = {}
+        self._started = time.perf_counter()
+
+    @contextmanager
+    def stage(self, name, rows=None):
+        """Замеряет этап; число строк можно указать сразу или записать в record['rows']."""
+        record = {'name': name, 'rows': rows}
+        started = time.perf_counter()
+        try:
+            yield record
+        finally:
+            record['ms'] = round((time.perf_counter() - started) * 1000, 3)
+            self.stages.append(record)
+
+    def cache_event(self, name, hit):
+        counters = self.cache.setdefault(name, {'hits': 0, 'misses': 0})
+        counters['hits' if hit else 'misses'] += 1
+
+    def cached(self, name, func, *args):
+        """Вызывает функцию под st.cache_* как этап и отмечает попадание или промах.
+
+        Промах фиксирует сама функция вызовом cache_miss(name) в своём теле,
+        которое Streamlit выполняет только при промахе.
+        """
+        misses = self.cache.get(name, {}).get('misses', 0)
+        with self.stage(name):
+            result = func(*args)
+        if self.cache.get(name, {}).get('misses', 0) == misses:
+            self.cache_event(name, hit=True)
+        return result
+
+    @property
+    def total_ms(self):
+        return round((time.perf_counter() - self._started) * 1000, 3)
+
+    def record(self):
+        return {
+            'ts': datetime.now(timezone.utc).isoformat(timespec='milliseconds'),
+            'session': self.session,
+            'view': self.view,
+            'total_ms': self.total_ms,
+            'stages': self.stages,
+            'cache': self.cache,
+        }
+
+    def stages_frame(self):
+        return pd.DataFrame(self.stages, columns=['name', 'ms', 'rows'])
+
+    def write(self, path=LOG_PATH):
+        """Дописывает итог перезапуска строкой JSON в журнал."""
+        if not path:
+            return
+        line = json.dumps(self.record(), ensure_ascii=False)
+        path = Path(path)
+        with _log_lock:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            with open(path, 'a', encoding='utf-8') as f:
+                f.write(line + '\n')
+
+
+def start(view=None, session=None):
+    """Создаёт Profiler для текущего перезапуска и делает его текущим."""
+    profiler = Profiler(view, session)
+    _current.set(profiler)
+    return profiler
+
+
+def current():
+    """Текущий Profiler или None вне дашборда (бенчмарки, скрипты)."""
+    return _current.get()
+
+
+@contextmanager
+def stage(name, rows=None):
+    """Этап текущего перезапуска; вне дашборда (бенчмарки, скрипты) не замеряется."""
+    profiler = current()
+    if profiler is None:
+        yield {'name': name, 'rows': rows}
+        return
+    with profiler.stage(name, rows) as record:
+        yield record
+
+
+@contextmanager
+def background(view):
+    """Замеры работы вне перезапуска (фоновое обновление) отдельной записью журнала."""
+    profiler = Profiler(view)
+    token = _current.set(profiler)
+    try:
+        yield profiler
+    finally:
+        _current.reset(token)
+        profiler.write()
+
+
+def cache_miss(name):
+    """Отмечает промах кеша name в текущем перезапуске."""
+    profiler = current()
+    if profiler is not None:
+        profiler.cache_event(name, hit=False)
+
+
+def cache_event(name, hit):
+    """Отмечает попадание или промах кеша name в текущем перезапуске."""
+    profiler = current()
+    if profiler is not None:
+        profiler.cache_event(name, hit)
+
+
+def read_log(path=LOG_PATH):
+    """Журнал как таблица этапов: одна строка на этап каждого перезапуска."""
+    records = []
+    with open(path, encoding='utf-8') as f:
+        for line in f:
+            run = json.loads(line)
+            records.append({'view': run['view'], 'name': 'total', 'ms': run['total_ms'], 'rows': None})
+            for stage in run['stages']:
+                records.append({'view': run['view'], **stage})
+    return pd.DataFrame(records, columns=['view', 'name', 'ms', 'rows'])
+
+
+def latency_percentiles(path=LOG_PATH, percentiles=(0.5, 0.9, 0.99)):
+    """Перцентили времени этапов по визуализациям."""
+    stages = read_log(path)
+    grouped = stages.groupby(['view', 'name'], dropna=False)['ms']
+    result = grouped.quantile(list(percentiles)).unstack()
+    result.columns = [f'p{round(q * 100)}' for q in percentiles]
+    result['count'] = grouped.size()
+    return result
+
+
+if __name__ == '__main__':
+    print(latency_percentiles(sys.argv[1] if len(sys.argv) > 1 else LOG_PATH).round(2).to_string())
@@ -0,0 +1,63 @@
+"""Рейтинг всех сотрудников по месяцам.
+
+Ранги и процентили считаются одним векторным проходом groupby по таблице
+сотрудник × месяц для всей численности сразу. Таблица отсортирована по
+месяцу, поэтому месяц выбирается срезом через searchsorted.
+"""
+
+from skills_dashboard.index import month_slice
+
+# Показатели рейтинга: колонка значения -> (колонка места, колонка процентиля)
+METRICS = {
+    'points_sum': ('rank_points_sum', 'pct_points_sum'),
+    'points_per_day': ('rank_points_per_day', 'pct_points_per_day'),
+    'skills_mark': ('rank_skills_mark', 'pct_skills_mark'),
+}
+
+
+def build_leaderboard(employee_month, employees, areas=None):
+    """Строит таблицу рейтинга по таблице сотрудник × месяц.
+
+    employees - справочник ФИО, areas - Series id_employee -> участок
+    (необязательно). Месяцы без ежедневных очков не участвуют в рейтинге по
+    очкам, месяцы без оценки - в рейтинге по Skills Mark. Место 1 - лучший
+    результат, процентиль 100 - лучше или наравне со всеми.
+    """
+    board = employee_month[['id_employee', 'month_key', 'points_sum', 'days', 'skills_mark']]
+    board = board[(board['days'] > 0) | board['skills_mark'].notna()].copy()
+    worked = board['days'] > 0
+    board['points_sum'] = board['points_sum'].where(worked)
+    board['points_per_day'] = board['points_sum'] / board['days'].where(worked)
+
+    grouped = board.groupby('month_key')
+    for column, (rank_column, pct_column) in METRICS.items():
+        board[rank_column] = grouped[column].rank(ascending=False, method='min').astype('float32')
+        board[pct_column] = (grouped[column].rank(method='max', pct=True) * 100).astype('float32')
+
+    board = board.merge(employees, on='id_employee', how='left')
+    board['area'] = board['id_employee'].map(areas) if areas is not None else None
+    return Leaderboard(board)
+
+
+class Leaderboard:
+    """Рейтинг, отсортированный по (month_key, место по сумме очков)."""
+
+    def __init__(self, board):
+        self.frame = board.sort_values(['month_key', 'rank_points_sum'], kind='stable', ignore_index=True)
+        self.month_keys = self.frame['month_key'].to_numpy()
+
+    def month(self, month):
+        """Строки рейтинга за месяц без копирования."""
+        return month_slice(self.frame, self.month_keys, month)
+
+    def ranking(self, month, metric='points_sum', area=None):
+        """Рейтинг месяца по показателю metric, при необходимости по одному участку."""
+        board = self.month(month)
+        if area is not None:
+            board = board[board['area'] == area]
+        rank_column, _ = METRICS[metric]
+        board = board[board[rank_column].notna()]
+        return board.sort_values(rank_column, kind='stable')
+
+    def areas(self):
+        return sorted(self.frame['area'].dropna().unique())
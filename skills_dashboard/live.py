@@ -0,0 +1,163 @@
+"""Живое обновление данных при изменении файлов в output/.
+
+Наблюдатель watchdog отмечает изменения, фоновый поток после паузы
+заново разбирает только изменённые партиции, точечно обновляет таблицы
+и атомарно подменяет снимок (версия, Dataset). Сессии читают снимок без
+блокировок и не видят наполовину обновлённых данных. Новая версия
+сохраняется в общий снимок Arrow (см. snapshot), и другие процессы
+сервера открывают её, не пересчитывая.
+"""
+
+import logging
+import threading
+
+import pandas as pd
+from watchdog.events import FileSystemEventHandler
+from watchdog.observers import Observer
+
+from skills_dashboard import dataset, ingest, instrumentation, snapshot, verify
+from skills_dashboard.task_store import FAMILY as TASKS_FAMILY
+from skills_dashboard.task_store import TaskStore
+
+logger = logging.getLogger(__name__)
+
+# Пауза после последнего события: файл обычно пишется несколькими вызовами
+DEBOUNCE_SECONDS = 1.0
+
+
+class _ChangeHandler(FileSystemEventHandler):
+    """Отмечает любое изменение файлов каталога."""
+
+    def __init__(self, dirty):
+        self.dirty = dirty
+
+    def on_any_event(self, event):
+        if not event.is_directory:
+            self.dirty.set()
+
+
+class DataStore:
+    """Снимок данных дашборда, который обновляется при изменении output/.
+
+    snapshot() возвращает пару (версия, Dataset); обновление собирает новый
+    Dataset рядом со старым и подменяет пару одним присваиванием. Задания
+    хранятся в общем TaskStore, из которого изменённые месяцы вытесняются.
+    """
+
+    def __init__(self, output_dir=ingest.OUTPUT_DIR, cache_dir=ingest.CACHE_DIR):
+        self.output_dir = output_dir
+        self.cache_dir = cache_dir
+        self.task_store = TaskStore(output_dir=output_dir, cache_dir=cache_dir)
+        self._lock = threading.Lock()
+        self._dirty = threading.Event()
+        self._observer = None
+        self._states = ingest.file_states(output_dir)
+        version = ingest.data_version(states=self._states)
+        # Снимок этой версии мог уже подготовить другой процесс сервера
+        self._snapshot = (version, snapshot.load_or_build(version, output_dir, cache_dir))
+
+    def snapshot(self):
+        """Текущая пара (версия данных, Dataset)."""
+        return self._snapshot
+
+    @property
+    def version(self):
+        return self._snapshot[0]
+
+    def refresh(self):
+        """Синхронизирует изменённые и удалённые файлы и подменяет снимок.
+
+        Возвращает True, если версия данных изменилась.
+        """
+        with self._lock:
+            states = ingest.file_states(self.output_dir)
+            updated = [item for item, state in states.items() if self._states.get(item) != state]
+            deleted = [item for item in self._states if item not in states]
+            if not updated and not deleted:
+                return False
+
+            with instrumentation.background('refresh'):
+                self._update(states, updated, deleted)
+            logger.info('Данные обновлены: %d изменённых, %d удалённых файлов', len(updated), len(deleted))
+            return True
+
+    def _update(self, states, updated, deleted):
+        """Разбирает изменённые файлы и подменяет снимок; вызывается под self._lock."""
+        from_tasks = dataset.POINTS_SOURCE == 'tasks'
+        # Манифест общий с потоками сессий, которые в это время синхронизируют задания
+        with ingest.SYNC_LOCK:
+            with instrumentation.stage('sync', rows=len(updated) + len(deleted)):
+                manifest = ingest.Manifest(self.cache_dir)
+                changed, removed, task_keys = {}, {}, []
+                for family, key in deleted:
+                    ingest.drop_partition(family, key, manifest)
+                    if family == TASKS_FAMILY:
+                        task_keys.append(key)
+                        if from_tasks:
+                            removed.setdefault(verify.FAMILY, set()).add(key)
+                    elif not (from_tasks and family == verify.FAMILY):
+                        removed.setdefault(family, set()).add(key)
+                for family, key in updated:
+                    if family == TASKS_FAMILY:
+                        # Задания разбираются лениво при следующем обращении к месяцу
+                        task_keys.append(key)
+                        continue
+                    if from_tasks and family == verify.FAMILY:
+                        continue
+                    ingest.sync_partition(family, key, states[family, key][0], manifest)
+                    changed.setdefault(family, {})[key] = pd.read_parquet(manifest.partition_path(family, key))
+                manifest.save()
+
+            if from_tasks and task_keys:
+                # Ежедневные очки пересчитываются только по изменённым месяцам заданий
+                # В процессе сервера без пула: fork многопоточного процесса небезопасен
+                with instrumentation.stage('derived_points', rows=len(task_keys)):
+                    verify.run(self.output_dir, self.cache_dir, workers=1, stale_only=True)
+                for key in set(task_keys) - removed.get(verify.FAMILY, set()):
+                    path = verify.derived_path(key, self.cache_dir)
+                    changed.setdefault(verify.FAMILY, {})[key] = pd.read_parquet(path)
+
+        version = ingest.data_version(states=states)
+        with instrumentation.stage('open_snapshot'):
+            data = snapshot.open_snapshot(version, self.cache_dir)
+        if data is None:
+            _, previous = self._snapshot
+            with instrumentation.stage('update_dataset'):
+                data = dataset.update_dataset(previous, changed, removed) if changed or removed else previous
+            with instrumentation.stage('write_snapshot'):
+                snapshot.write_snapshot(data, version, self.cache_dir)
+        self.task_store.invalidate(task_keys)
+        self._states = states
+        self._snapshot = (version, data)
+
+    def watch(self):
+        """Запускает наблюдение за output/ в фоновых потоках; повторный вызов ничего не делает."""
+        with self._lock:
+            if self._observer is not None:
+                return
+            observer = Observer()
+            observer.daemon = True
+            observer.schedule(_ChangeHandler(self._dirty), str(self.output_dir), recursive=False)
+            observer.start()
+            threading.Thread(target=self._refresh_loop, name='skills-refresh', daemon=True).start()
+            self._observer = observer
+
+    def stop(self):
+        """Останавливает наблюдатель."""
+        if self._observer is not None:
+            self._observer.stop()
+            self._observer.join()
+            self._observer = None
+
+    def _refresh_loop(self):
+        while True:
+            self._dirty.wait()
+            self._dirty.clear()
+            # Новые события во время паузы продлевают её
+            while self._dirty.wait(DEBOUNCE_SECONDS):
+                self._dirty.clear()
+            try:
+                self.refresh()
+            except Exception:
+                # Файл мог быть недописан: ошибку пишем в лог, снимок остаётся прежним
+                logger.exception('Не удалось обновить данные из %s', self.output_dir)
@@ -0,0 +1,70 @@
+"""Плотная матрица очков сотрудник × день для сравнения многих сотрудников.
+
+Матрица строится один раз из ежедневных очков. Скользящие средние и
+накопленные суммы считаются сразу для всех выбранных сотрудников через
+кумулятивные суммы по оси дат, без циклов по сотрудникам.
+"""
+
+import numpy as np
+import pandas as pd
+
+
+class PointsMatrix:
+    """Очки в виде матрицы [сотрудник, день] и маска рабочих дней.
+
+    Строки упорядочены по id_employee, столбцы - все дни от первой до
+    последней даты. Дни без записей хранятся как 0 с пустой маской.
+    """
+
+    def __init__(self, points):
+        self.ids = np.unique(points['id_employee'].to_numpy())
+        first, last = points['date'].min(), points['date'].max()
+        self.dates = pd.date_range(first, last, freq='D')
+
+        rows = np.searchsorted(self.ids, points['id_employee'].to_numpy())
+        cols = (points['date'].to_numpy() - first.to_datetime64()) // np.timedelta64(1, 'D')
+
+        self.values = np.zeros((len(self.ids), len(self.dates)), dtype=np.float32)
+        self.worked = np.zeros((len(self.ids), len(self.dates)), dtype=bool)
+        self.values[rows, cols] = points['points'].to_numpy()
+        self.worked[rows, cols] = True
+
+    @property
+    def nbytes(self):
+        return self.values.nbytes + self.worked.nbytes
+
+    def rows(self, employee_ids):
+        """Позиции строк для id сотрудников; отсутствующие id отбрасываются."""
+        employee_ids = np.asarray(employee_ids)
+        positions = np.searchsorted(self.ids, employee_ids)
+        positions = np.minimum(positions, len(self.ids) - 1)
+        return positions[self.ids[positions] == employee_ids]
+
+    @staticmethod
+    def _window_sum(cumulative, window):
+        """Суммы за скользящее окно по кумулятивным суммам с ведущим нулевым столбцом."""
+        return cumulative[:, window:] - cumulative[:, :-window]
+
+    def rolling_mean(self, employee_ids, window):
+        """Среднее очков за рабочие дни в окне из window календарных дней.
+
+        Возвращает (id сотрудников, матрица [сотрудник, день]); NaN там, где
+        в окне не было рабочих дней.
+        """
+        rows = self.rows(employee_ids)
+        padding = np.zeros((len(rows), 1))
+        # Для первых дней окно неполное: дополняем слева window - 1 нулевыми днями
+        leading = np.zeros((len(rows), window - 1))
+        values = np.hstack([padding, leading, self.values[rows]]).cumsum(axis=1)
+        counts = np.hstack([padding, leading, self.worked[rows]]).cumsum(axis=1)
+
+        sums = self._window_sum(values, window)
+        days = self._window_sum(counts, window)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            means = np.where(days > 0, sums / days, np.nan)
+        return self.ids[rows], means
+
+    def cumulative(self, employee_ids):
+        """Накопленная сумма очков по дням: (id сотрудников, матрица)."""
+        rows = self.rows(employee_ids)
+        return self.ids[rows], self.values[rows].cumsum(axis=1, dtype=np.float64)
@@ -0,0 +1,57 @@
+"""Отчёт о памяти, занимаемой таблицами дашборда.
+
+Сравнивает исходную раскладку (все колонки CSV, строки-объекты, ФИО,
+повторённое в каждой строке) с компактной звёздной схемой.
+
+    python -m skills_dashboard.memory
+"""
+
+import pandas as pd
+
+from skills_dashboard import dimensions, ingest
+
+
+def frame_bytes(df):
+    """Размер таблицы в байтах с учётом содержимого строк."""
+    return int(df.memory_usage(deep=True).sum())
+
+
+def raw_frames(output_dir=ingest.OUTPUT_DIR):
+    """Таблицы в исходной раскладке: полный read_csv и merge имён."""
+    frames = {
+        family: pd.concat(
+            [ingest.read_source(path) for path in ingest.discover(family, output_dir).values()],
+            ignore_index=True,
+        )
+        for family in ingest.FAMILIES
+    }
+    names = frames['skills_mark'][['id_employee', 'fio_employee']].drop_duplicates()
+    frames['employee_points_daily'] = frames['employee_points_daily'].merge(names, on='id_employee', how='left')
+    frames['tasks_full'] = frames['tasks_full'].merge(names, on='id_employee', how='left')
+    return frames
+
+
+def compact_frames(output_dir=ingest.OUTPUT_DIR, cache_dir=ingest.CACHE_DIR):
+    """Таблицы в раскладке, которую строит load_data."""
+    frames = ingest.load_all(output_dir, cache_dir)
+    frames['employees'] = dimensions.employee_dimension(frames['skills_mark'])
+    frames['tasks_full'], frames['products'] = dimensions.split_tasks(frames['tasks_full'])
+    return frames
+
+
+def memory_report(output_dir=ingest.OUTPUT_DIR, cache_dir=ingest.CACHE_DIR):
+    """Таблица: байты на каждую таблицу до и после."""
+    before = {name: frame_bytes(df) for name, df in raw_frames(output_dir).items()}
+    after = {name: frame_bytes(df) for name, df in compact_frames(output_dir, cache_dir).items()}
+    report = pd.DataFrame({'before': pd.Series(before), 'after': pd.Series(after)}).fillna(0).astype('int64')
+    report.loc['total'] = report.sum()
+    report['ratio'] = (report['before'] / report['after']).where(report['before'] > 0).round(2)
+    return report
+
+
+if __name__ == '__main__':
+    report = memory_report()
+    print(report.to_string(formatters={
+        'before': lambda value: f'{value / 2**20:.2f} MiB',
+        'after': lambda value: f'{value / 2**20:.2f} MiB',
+    }))
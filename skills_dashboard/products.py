@@ -0,0 +1,134 @@
+"""Аналитика по изделиям: агрегат изделие × месяц и обратный индекс изделие -> сотрудники.
+
+Агрегаты строятся при смене версии данных: один проход groupby по всем
+заданиям даёт таблицу изделие × месяц × сотрудник, остальное считается
+по ней. Топ изделий за месяц и разбивка изделия по сотрудникам берутся
+срезами отсортированных таблиц, без groupby на перезапуске.
+Изделие - пара (sap_id, sap_name), как в графике топ-10 изделий.
+"""
+
+import numpy as np
+
+from skills_dashboard import ingest
+from skills_dashboard.aggregates import month_key
+from skills_dashboard.index import month_slice, offsets
+from skills_dashboard.task_store import FAMILY
+
+PRODUCT_COLUMNS = ['sap_id', 'sap_name']
+TASK_COLUMNS = [
+    'id_employee', 'date', 'sap_id', 'sap_name', 'units_made', 'norma_product_adjusted_with_discounts', 'points',
+]
+SUM_COLUMNS = ['points', 'units_made', 'normed_units', 'norma', 'tasks']
+
+# Показатели топа изделий: колонка -> подпись
+METRICS = {
+    'points': 'Очки',
+    'units_made': 'Выпуск, шт.',
+    'norm_attainment': 'Выполнение нормы, %',
+}
+
+
+def load_product_tasks(output_dir=ingest.OUTPUT_DIR, cache_dir=ingest.CACHE_DIR):
+    """Все задания, только колонки для аналитики по изделиям."""
+    return ingest.load_family(FAMILY, output_dir, cache_dir, columns=TASK_COLUMNS)
+
+
+def _attainment(frame):
+    """Выполнение нормы в процентах: выпуск по нормируемым заданиям к сумме норм."""
+    return (frame['normed_units'] / frame['norma'].where(frame['norma'] > 0) * 100).astype('float32')
+
+
+def build_product_stats(tasks, employees):
+    """Строит агрегаты по изделиям из таблицы заданий.
+
+    employees - справочник ФИО. Выполнение нормы считается только по
+    заданиям с положительной нормой; у изделий без нормы оно NaN.
+    """
+    norma = tasks['norma_product_adjusted_with_discounts'].to_numpy(np.float64)
+    normed = norma > 0
+    units = tasks['units_made'].to_numpy(np.float64)
+    frame = tasks[['id_employee', *PRODUCT_COLUMNS]].assign(
+        month_key=month_key(tasks['date']).astype(np.int32),
+        # Очки хранятся во float32, суммируем во float64
+        points=tasks['points'].to_numpy(np.float64),
+        units_made=units,
+        normed_units=np.where(normed, units, 0.0),
+        norma=np.where(normed, norma, 0.0),
+        tasks=1,
+    )
+
+    # Один проход по всем заданиям: изделие × месяц × сотрудник. Остальные
+    # агрегаты строятся по этой таблице, она в разы меньше таблицы заданий
+    base = frame.groupby(
+        [*PRODUCT_COLUMNS, 'month_key', 'id_employee'], observed=True, dropna=False
+    )[SUM_COLUMNS].sum().reset_index()
+
+    # В строках base сотрудник изделия за месяц уникален, число строк - число сотрудников
+    by_product = base.groupby([*PRODUCT_COLUMNS, 'month_key'], observed=True, dropna=False)
+    product_month = by_product[SUM_COLUMNS].sum()
+    product_month['employees'] = by_product['id_employee'].count()
+    product_month = product_month.reset_index()
+
+    by_total = base.groupby(PRODUCT_COLUMNS, observed=True, dropna=False)
+    product_total = by_total[SUM_COLUMNS].sum()
+    product_total['employees'] = by_total['id_employee'].nunique()
+    product_total = product_total.reset_index()
+    for products in (product_month, product_total):
+        products['sap_name'] = products['sap_name'].astype(object)
+
+    # Обратный индекс sap_id -> сотрудники (все названия одного sap_id вместе)
+    workers = base.groupby(['sap_id', 'month_key', 'id_employee'])[SUM_COLUMNS].sum().reset_index()
+    worker_total = workers.groupby(['sap_id', 'id_employee'])[SUM_COLUMNS].sum().reset_index()
+
+    return ProductStats(product_month, product_total, workers, worker_total, employees)
+
+
+class ProductStats:
+    """Агрегаты по изделиям с индексами для выборки срезом.
+
+    product_month отсортирована по (месяц, очки по убыванию); workers
+    (sap_id × месяц × сотрудник) и worker_total (sap_id × сотрудник) -
+    по sap_id и очкам по убыванию, с таблицами смещений sap_id -> [start, end).
+    """
+
+    def __init__(self, product_month, product_total, workers, worker_total, employees):
+        for frame in (product_month, product_total, workers, worker_total):
+            frame['norm_attainment'] = _attainment(frame)
+
+        self.product_month = product_month.sort_values(
+            ['month_key', 'points'], ascending=[True, False], kind='stable', ignore_index=True
+        )
+        self.month_keys = self.product_month['month_key'].to_numpy()
+        self.product_total = product_total.sort_values('points', ascending=False, kind='stable', ignore_index=True)
+
+        names = employees.set_index('id_employee')['fio_employee']
+        self.workers, self.worker_offsets = self._inverted(workers, names, ['sap_id', 'month_key', 'points'])
+        self.worker_total, self.total_offsets = self._inverted(worker_total, names, ['sap_id', 'points'])
+
+    @staticmethod
+    def _inverted(frame, names, order):
+        """Сортирует таблицу по sap_id и строит смещения sap_id -> [start, end)."""
+        ascending = [True] * (len(order) - 1) + [False]
+        frame = frame.assign(fio_employee=frame['id_employee'].map(names))
+        frame = frame.sort_values(order, ascending=ascending, kind='stable', ignore_index=True)
+        return frame, offsets(frame['sap_id'].to_numpy())
+
+    def month(self, month):
+        """Изделия месяца, отсортированные по очкам, без копирования."""
+        return month_slice(self.product_month, self.month_keys, month)
+
+    def top(self, month=None, metric='points', n=10):
+        """Топ-n изделий за месяц (None - за весь период) по показателю metric."""
+        products = self.product_total if month is None else self.month(month)
+        if metric == 'points':
+            return products.head(n)
+        return products.nlargest(n, metric)
+
+    def workers_of(self, sap_id, month=None):
+        """Кто делает изделие sap_id: сотрудники по убыванию очков за месяц или весь период."""
+        if month is None:
+            start, end = self.total_offsets.get(sap_id, (0, 0))
+            return self.worker_total.iloc[start:end]
+        start, end = self.worker_offsets.get(sap_id, (0, 0))
+        rows = self.workers.iloc[start:end]
+        return month_slice(rows, rows['month_key'].to_numpy(), month)
@@ -0,0 +1,86 @@
+"""Общий для процесса LRU-кеш готовых графиков и итогов визуализаций.
+
+Ключ - (визуализация, сотрудник, месяц, ...), значение - то, что
+визуализация выводит: go.Figure и итоги для st.metric. Повторный просмотр
+той же выборки (в том числе из другой сессии) не строит график заново.
+Размер записи оценивается по JSON графика, общий объём ограничен
+бюджетом памяти. При смене версии данных кеш очищается целиком.
+"""
+
+import os
+import pickle
+import threading
+from collections import OrderedDict
+
+import plotly.io as pio
+
+from skills_dashboard import instrumentation
+
+# Бюджет памяти кеша в мегабайтах, можно переопределить переменной окружения
+DEFAULT_BUDGET_MB = int(os.environ.get('SKILLS_RENDER_CACHE_MB', '64'))
+
+
+def entry_bytes(value):
+    """Оценка размера записи: графики - по длине JSON, остальное - по pickle."""
+    size = 0
+    for item in value.values():
+        if hasattr(item, 'to_plotly_json'):
+            size += len(pio.to_json(item, validate=False))
+        else:
+            size += len(pickle.dumps(item))
+    return size
+
+
+class RenderCache:
+    """LRU-кеш результатов визуализаций с ограничением по памяти.
+
+    Значения разделяются между сессиями, изменять их нельзя. Графики
+    хранятся объектами go.Figure: st.plotly_chart собирает Figure из
+    словаря дольше, чем строит график заново.
+    """
+
+    def __init__(self, budget_mb=DEFAULT_BUDGET_MB):
+        self.budget_bytes = budget_mb * 2**20
+        self.version = None
+        self._entries = OrderedDict()
+        self._sizes = {}
+        self._lock = threading.Lock()
+
+    @property
+    def nbytes(self):
+        return sum(self._sizes.values())
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, version, key, build):
+        """Результат build() для ключа key при версии данных version.
+
+        build возвращает словарь (например, {'figure': ..., 'summary': ...}).
+        """
+        with self._lock:
+            if version != self.version:
+                self._entries.clear()
+                self._sizes.clear()
+                self.version = version
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                instrumentation.cache_event('render', hit=True)
+                return self._entries[key]
+        instrumentation.cache_event('render', hit=False)
+
+        # Строим вне блокировки: другие сессии в это время читают кеш
+        value = build()
+        size = entry_bytes(value)
+        with self._lock:
+            # Пока строили, данные могли обновиться - устаревший результат не сохраняем
+            if version == self.version:
+                self._entries[key] = value
+                self._sizes[key] = size
+                self._evict()
+        return value
+
+    def _evict(self):
+        while len(self._entries) > 1 and self.nbytes > self.budget_bytes:
+            key, _ = self._entries.popitem(last=False)
+            del self._sizes[key]
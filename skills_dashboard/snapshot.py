@@ -0,0 +1,120 @@
+"""Общий снимок подготовленных таблиц в файлах Arrow IPC.
+
+Подготовленные таблицы (с разобранными датами, справочником ФИО,
+отсортированные по сотруднику и дате) сохраняются в несжатые файлы
+Arrow IPC в каталоге версии данных. Процессы сервера открывают их через
+memory map без копирования: несколько процессов делят одну копию в
+страничном кеше ОС, а перезапущенный процесс не разбирает CSV и Parquet.
+
+Запуск: python -m skills_dashboard.snapshot
+"""
+
+import os
+import shutil
+import time
+from pathlib import Path
+
+from pyarrow import feather
+
+from skills_dashboard import dataset, ingest, instrumentation
+from skills_dashboard.dataset import Dataset, load_dataset
+from skills_dashboard.index import EmployeeIndex
+
+TABLES = ['points', 'skills', 'employees', 'employee_month', 'calendar']
+
+# Сколько последних снимков хранить: старые могут быть ещё открыты процессами
+KEEP_SNAPSHOTS = 2
+
+
+def snapshot_dir(version, cache_dir=ingest.CACHE_DIR):
+    # Источник ежедневных очков меняет содержимое снимка при тех же файлах
+    return Path(cache_dir) / 'snapshots' / f'{version}_{dataset.POINTS_SOURCE}'
+
+
+def write_snapshot(data, version, cache_dir=ingest.CACHE_DIR):
+    """Сохраняет Dataset как снимок версии version; существующий снимок не перезаписывается.
+
+    Файлы пишутся во временный каталог, который затем переименовывается,
+    поэтому другие процессы видят снимок либо целиком, либо никак.
+    """
+    target = snapshot_dir(version, cache_dir)
+    if target.is_dir():
+        return target
+    frames = {
+        'points': data.points.frame,
+        'skills': data.skills.frame,
+        'employees': data.employees,
+        'employee_month': data.employee_month.frame,
+        'calendar': data.calendar,
+    }
+    tmp = target.with_name(f'{target.name}.{os.getpid()}.tmp')
+    tmp.mkdir(parents=True, exist_ok=True)
+    for name, frame in frames.items():
+        # Без сжатия: иначе открыть файл через memory map без копирования нельзя
+        feather.write_feather(frame, tmp / f'{name}.arrow', compression='uncompressed')
+    try:
+        os.rename(tmp, target)
+    except OSError:
+        # Тот же снимок успел записать другой процесс
+        shutil.rmtree(tmp, ignore_errors=True)
+    prune(cache_dir)
+    return target
+
+
+def open_snapshot(version, cache_dir=ingest.CACHE_DIR):
+    """Открывает снимок версии version без копирования; None, если снимка нет.
+
+    Числовые колонки и даты ссылаются на отображённые в память файлы и
+    доступны только для чтения.
+    """
+    target = snapshot_dir(version, cache_dir)
+    try:
+        frames = {
+            name: feather.read_table(target / f'{name}.arrow', memory_map=True).to_pandas(split_blocks=True)
+            for name in TABLES
+        }
+    except FileNotFoundError:
+        return None
+    # Таблицы в снимке уже отсортированы, индексы строятся за один проход
+    return Dataset(
+        points=EmployeeIndex(frames['points'], sort=False),
+        skills=EmployeeIndex(frames['skills'], sort=False),
+        employees=frames['employees'],
+        employee_month=EmployeeIndex(frames['employee_month'], sort=False),
+        calendar=frames['calendar'],
+    )
+
+
+def prune(cache_dir=ingest.CACHE_DIR, keep=KEEP_SNAPSHOTS):
+    """Удаляет старые снимки, оставляя keep последних."""
+    root = Path(cache_dir) / 'snapshots'
+    snapshots = sorted(
+        (path for path in root.iterdir() if path.is_dir() and not path.name.endswith('.tmp')),
+        key=lambda path: path.stat().st_mtime_ns,
+    )
+    for path in snapshots[:-keep]:
+        # На Linux файлы, открытые другими процессами, остаются доступны им до закрытия
+        shutil.rmtree(path, ignore_errors=True)
+
+
+def load_or_build(version, output_dir=ingest.OUTPUT_DIR, cache_dir=ingest.CACHE_DIR):
+    """Открывает снимок версии, а если его нет - загружает данные и сохраняет снимок."""
+    with instrumentation.stage('open_snapshot'):
+        data = open_snapshot(version, cache_dir)
+    if data is None:
+        with instrumentation.stage('load_dataset'):
+            data = load_dataset(output_dir, cache_dir)
+        with instrumentation.stage('write_snapshot'):
+            write_snapshot(data, version, cache_dir)
+    return data
+
+
+if __name__ == '__main__':
+    started = time.perf_counter()
+    version = ingest.data_version()
+    load_or_build(version)
+    built_s = time.perf_counter() - started
+
+    started = time.perf_counter()
+    open_snapshot(version)
+    print(f'Снимок {snapshot_dir(version)}: подготовка {built_s:.2f} с, открытие {time.perf_counter() - started:.3f} с')
@@ -0,0 +1,89 @@
+"""Постраничная таблица заданий сотрудника за месяц.
+
+Срез заданий с атрибутами изделий и отформатированной датой готовится
+один раз и кешируется; порядок строк для каждой сортировки считается
+один раз (np.lexsort) и тоже запоминается. Страница - это фильтр по
+готовым массивам и iloc по номерам строк, без копирования и сортировки
+всего среза на каждом перезапуске.
+"""
+
+import numpy as np
+import pandas as pd
+
+# Сортировки таблицы: подпись -> (колонка, дополнительная колонка для равных значений)
+SORTS = {
+    'Дата': ('date', 'points'),
+    'Очки': ('points', 'date'),
+    'SAP ID': ('sap_id', 'date'),
+    'Количество': ('units_made', 'date'),
+}
+
+PAGE_SIZES = [25, 50, 100, 200]
+
+
+class TaskTable:
+    """Задания сотрудника за месяц с постраничной выдачей, сортировкой и фильтрами."""
+
+    def __init__(self, tasks):
+        self.frame = tasks.assign(date_formatted=tasks['date'].dt.date)
+        self._columns = {
+            column: self.frame[column].to_numpy()
+            for column in ['date', 'date_formatted', 'points', 'sap_id', 'units_made', 'area']
+        }
+        self._orders = {}
+
+        # Значения для фильтров: даты, изделия по убыванию очков, участки
+        self.dates = sorted(set(self.frame['date_formatted']))
+        products = self.frame.groupby(['sap_id', 'sap_name'])['points'].sum().sort_values(ascending=False)
+        self.products = products.reset_index()[['sap_id', 'sap_name']]
+        self.areas = sorted(self.frame['area'].dropna().unique())
+
+    def __len__(self):
+        return len(self.frame)
+
+    def order(self, sort='Дата', ascending=True):
+        """Номера строк в порядке сортировки; вычисляется один раз на сортировку.
+
+        Дополнительная колонка всегда по убыванию, как очки внутри дня в
+        исходной таблице. Пропуски - в конце при любом направлении.
+        """
+        key = (sort, ascending)
+        if key not in self._orders:
+            column, tie = SORTS[sort]
+            values = self._columns[column]
+            primary = self._rank(values)
+            # lexsort сортирует по последнему ключу, равные значения - по предыдущим
+            self._orders[key] = np.lexsort((
+                -self._rank(self._columns[tie]),
+                primary if ascending else -primary,
+                pd.isna(values),
+            ))
+        return self._orders[key]
+
+    @staticmethod
+    def _rank(values):
+        """Плотные ранги значений, чтобы даты и числа сортировались одинаково."""
+        _, inverse = np.unique(values, return_inverse=True)
+        return inverse.astype(np.int64)
+
+    def query(self, sort='Дата', ascending=True, date=None, sap_id=None, area=None):
+        """Номера строк после фильтров в порядке сортировки."""
+        order = self.order(sort, ascending)
+        mask = np.ones(len(self.frame), dtype=bool)
+        if date is not None:
+            mask &= self._columns['date_formatted'] == date
+        if sap_id is not None:
+            mask &= self._columns['sap_id'] == sap_id
+        if area is not None:
+            mask &= self._columns['area'] == area
+        return order[mask[order]]
+
+    def page(self, positions, page, page_size):
+        """Строки страницы page (с 1) из результата query."""
+        start = (page - 1) * page_size
+        return self.frame.iloc[positions[start:start + page_size]]
+
+
+def page_count(rows, page_size):
+    """Число страниц (хотя бы одна, даже для пустого результата)."""
+    return max(1, -(-rows // page_size))
@@ -0,0 +1,96 @@
+"""Ленивая помесячная загрузка заданий с LRU-кешем.
+
+Задания - самый большой набор данных, а нужны они только в детализации
+по изделиям. Партиция месяца читается при первом обращении и хранится в
+LRU-кеше, размер которого ограничен бюджетом памяти.
+"""
+
+import os
+import threading
+from collections import OrderedDict
+
+import pandas as pd
+
+from skills_dashboard import dimensions, ingest, instrumentation
+from skills_dashboard.index import EmployeeIndex
+from skills_dashboard.memory import frame_bytes
+
+FAMILY = 'tasks_full'
+
+# Бюджет памяти кеша в мегабайтах, можно переопределить переменной окружения
+DEFAULT_BUDGET_MB = int(os.environ.get('SKILLS_TASK_CACHE_MB', '256'))
+
+
+class TaskStore:
+    """LRU-кеш помесячных партиций заданий с ограничением по памяти.
+
+    Партиция хранится как (EmployeeIndex фактов, справочник изделий месяца).
+    Самая свежая партиция не вытесняется, даже если одна превышает бюджет.
+    """
+
+    def __init__(self, budget_mb=DEFAULT_BUDGET_MB, output_dir=ingest.OUTPUT_DIR, cache_dir=ingest.CACHE_DIR):
+        self.budget_bytes = budget_mb * 2**20
+        self.output_dir = output_dir
+        self.cache_dir = cache_dir
+        self._partitions = OrderedDict()
+        self._sizes = {}
+        self._lock = threading.Lock()
+
+    @property
+    def nbytes(self):
+        return sum(self._sizes.values())
+
+    def month(self, month):
+        """Партиция месяца: (EmployeeIndex заданий, справочник изделий) или None."""
+        period = pd.Period(month, freq='M')
+        key = f'{period.year:04d}_{period.month:02d}'
+        with self._lock:
+            if key in self._partitions:
+                self._partitions.move_to_end(key)
+                instrumentation.cache_event('task_partition', hit=True)
+                return self._partitions[key]
+            instrumentation.cache_event('task_partition', hit=False)
+
+            tasks = ingest.load_partition(FAMILY, key, self.output_dir, self.cache_dir)
+            if tasks is None:
+                return None
+            facts, products = dimensions.split_tasks(tasks)
+            partition = (EmployeeIndex(facts), products)
+
+            self._partitions[key] = partition
+            self._sizes[key] = frame_bytes(facts) + frame_bytes(products)
+            self._evict()
+            return partition
+
+    def employee_month(self, employee_id, month):
+        """Задания сотрудника за месяц с атрибутами изделий."""
+        partition = self.month(month)
+        if partition is None:
+            return pd.DataFrame()
+        tasks_index, products = partition
+        return dimensions.with_products(tasks_index.month(employee_id, month), products)
+
+    def invalidate(self, keys):
+        """Убирает из кеша партиции с ключами 'YYYY_MM' (файлы изменились или удалены)."""
+        with self._lock:
+            for key in keys:
+                if self._partitions.pop(key, None) is not None:
+                    del self._sizes[key]
+
+    def _evict(self):
+        while len(self._partitions) > 1 and self.nbytes > self.budget_bytes:
+            key, _ = self._partitions.popitem(last=False)
+            del self._sizes[key]
+
+
+def employee_areas(output_dir=ingest.OUTPUT_DIR, cache_dir=ingest.CACHE_DIR):
+    """Основной участок каждого сотрудника - участок, где у него больше всего заданий.
+
+    Из партиций читаются только колонки id_employee и area, сами задания
+    в память целиком не загружаются. Возвращает Series id_employee -> area.
+    """
+    tasks = ingest.load_family(FAMILY, output_dir, cache_dir, columns=['id_employee', 'area'])
+
+    counts = tasks.groupby(['id_employee', 'area'], observed=True).size().reset_index(name='tasks')
+    counts = counts.sort_values(['id_employee', 'tasks'], ascending=[True, False], kind='stable')
+    return counts.drop_duplicates('id_employee').set_index('id_employee')['area'].astype(object)
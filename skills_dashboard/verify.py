@@ -0,0 +1,169 @@
+"""Пересчёт и сверка ежедневных очков по заданиям.
+
+Файлы employee_points_daily_* и employee_daily_tasks_points_full_*
+выгружаются отдельно. Пайплайн заново считает очки каждого задания
+(skill_points_rating * capped_share), суммирует их по сотруднику и дню,
+сверяет суммы с опубликованными и сохраняет пересчитанные суммы в
+Parquet-партиции. Месяцы обрабатываются параллельно в пуле процессов.
+
+При SKILLS_POINTS_SOURCE=tasks дашборд берёт ежедневные очки из этих
+партиций и файлы employee_points_daily_* не читает.
+
+    python -m skills_dashboard.verify --workers 4 --report mismatches.csv
+"""
+
+import argparse
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from skills_dashboard import ingest
+
+TASK_COLUMNS = ['id_employee', 'date', 'skill_points_rating', 'capped_share', 'points']
+KEY_COLUMNS = ['id_employee', 'date']
+REPORT_COLUMNS = ['month', 'id_employee', 'date', 'points_derived', 'points_published', 'diff', 'bad_tasks']
+
+# Допустимое расхождение сумм: в CSV очки записаны с полной точностью float64
+TOLERANCE = 1e-6
+
+# Пересчитанные партиции заменяют семейство employee_points_daily
+FAMILY = 'employee_points_daily'
+MANIFEST_KEY = 'derived_points'
+
+
+def derived_path(key, cache_dir=ingest.CACHE_DIR):
+    return Path(cache_dir) / 'derived' / FAMILY / f'{key}.parquet'
+
+
+def _read(path, columns):
+    """Читает колонки исходного файла во float64 (для сверки нужна полная точность)."""
+    df = ingest.read_source(path, columns, {'id_employee': 'int32'})
+    df['date'] = pd.to_datetime(df['date'])
+    return df
+
+
+def derive_daily(tasks):
+    """Ежедневные очки по заданиям: пересчитанные очки заданий, суммированные по сотруднику и дню."""
+    points = tasks['skill_points_rating'].to_numpy(np.float64) * tasks['capped_share'].to_numpy(np.float64)
+    return tasks[KEY_COLUMNS].assign(points=points).groupby(KEY_COLUMNS, as_index=False)['points'].sum()
+
+
+def verify_month(key, tasks_path, daily_path, cache_dir=ingest.CACHE_DIR):
+    """Пересчитывает один месяц, сохраняет партицию и возвращает расхождения.
+
+    Расхождение - день сотрудника, где пересчитанная и опубликованная суммы
+    отличаются (или день есть только в одном из файлов), либо где у заданий
+    колонка points не равна skill_points_rating * capped_share.
+    """
+    if tasks_path is None:
+        tasks = pd.DataFrame({column: pd.Series(dtype=np.float64) for column in TASK_COLUMNS})
+        tasks = tasks.astype({'id_employee': 'int32', 'date': 'datetime64[us]'})
+    else:
+        tasks = _read(tasks_path, TASK_COLUMNS)
+    daily = derive_daily(tasks)
+
+    if tasks_path is not None:
+        partition = daily.astype({'points': np.float32})
+        ingest._write_atomic(derived_path(key, cache_dir), lambda tmp: partition.to_parquet(tmp, index=False))
+
+    recomputed = tasks['skill_points_rating'] * tasks['capped_share']
+    bad = tasks.loc[(tasks['points'] - recomputed).abs() > TOLERANCE, KEY_COLUMNS]
+    bad_tasks = bad.groupby(KEY_COLUMNS).size().rename('bad_tasks')
+
+    published = _read(daily_path, ['id_employee', 'date', 'points']) if daily_path is not None else daily.iloc[0:0]
+    merged = daily.merge(published, on=KEY_COLUMNS, how='outer', suffixes=('_derived', '_published'))
+    merged = merged.join(bad_tasks, on=KEY_COLUMNS)
+    merged['bad_tasks'] = merged['bad_tasks'].fillna(0).astype(np.int32)
+    merged['diff'] = merged['points_derived'] - merged['points_published']
+
+    mismatch = (
+        merged['diff'].abs().gt(TOLERANCE)
+        | merged['points_derived'].isna()
+        | merged['points_published'].isna()
+        | merged['bad_tasks'].gt(0)
+    )
+    return merged[mismatch].assign(month=key)[REPORT_COLUMNS]
+
+
+def _source_state(path):
+    stat = path.stat()
+    return {'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns}
+
+
+def run(output_dir=ingest.OUTPUT_DIR, cache_dir=ingest.CACHE_DIR, workers=None, stale_only=False):
+    """Пересчитывает и сверяет все месяцы (stale_only - только месяцы с изменёнными заданиями).
+
+    Возвращает таблицу расхождений с колонками REPORT_COLUMNS.
+    """
+    tasks_files = ingest.discover('tasks_full', output_dir)
+    daily_files = ingest.discover(FAMILY, output_dir)
+    # Манифест читается и сохраняется целиком: параллельная синхронизация заданий ждёт
+    with ingest.SYNC_LOCK:
+        manifest = ingest.Manifest(cache_dir)
+        entries = manifest.entries.setdefault(MANIFEST_KEY, {})
+
+        # Месяцы, файл заданий которых удалён, больше не входят в пересчитанные очки
+        for key in set(entries) - set(tasks_files):
+            derived_path(key, cache_dir).unlink(missing_ok=True)
+            del entries[key]
+
+        keys = sorted(set(tasks_files) | set(daily_files))
+        if stale_only:
+            keys = [
+                key for key in tasks_files
+                if entries.get(key) != _source_state(tasks_files[key]) or not derived_path(key, cache_dir).exists()
+            ]
+
+        jobs = [(key, tasks_files.get(key), daily_files.get(key), cache_dir) for key in keys]
+        if len(jobs) > 1 and workers != 1:
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                reports = list(pool.map(verify_month, *zip(*jobs)))
+        else:
+            reports = [verify_month(*job) for job in jobs]
+
+        for key in keys:
+            if key in tasks_files:
+                entries[key] = _source_state(tasks_files[key])
+        manifest.save()
+
+    reports = [report for report in reports if len(report)]
+    if not reports:
+        return pd.DataFrame(columns=REPORT_COLUMNS)
+    return pd.concat(reports, ignore_index=True)
+
+
+def derived_points(output_dir=ingest.OUTPUT_DIR, cache_dir=ingest.CACHE_DIR, workers=None):
+    """Ежедневные очки, пересчитанные из заданий, в схеме семейства employee_points_daily.
+
+    Пересчитываются только месяцы, файлы заданий которых изменились.
+    """
+    run(output_dir, cache_dir, workers, stale_only=True)
+    keys = ingest.discover('tasks_full', output_dir)
+    return ingest.read_partitions(FAMILY, [derived_path(key, cache_dir) for key in keys])
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Пересчёт и сверка ежедневных очков по заданиям')
+    parser.add_argument('--output-dir', type=Path, default=ingest.OUTPUT_DIR)
+    parser.add_argument('--cache-dir', type=Path, default=ingest.CACHE_DIR)
+    parser.add_argument('--workers', type=int, default=os.cpu_count())
+    parser.add_argument('--report', type=Path, help='CSV для расхождений')
+    args = parser.parse_args(argv)
+
+    report = run(args.output_dir, args.cache_dir, args.workers)
+    if args.report:
+        report.to_csv(args.report, index=False)
+    if report.empty:
+        print('Расхождений нет')
+        return 0
+    print(f'Расхождений: {len(report)} дней сотрудников')
+    print(report.groupby('month').size().rename('days').to_string())
+    return 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,70 @@
+"""Вычисления для визуализаций дашборда.
+
+Каждая функция возвращает данные для графика и итоги для st.metric и не
+зависит от Streamlit, поэтому её можно вызывать из бенчмарков и скриптов.
+"""
+
+import pandas as pd
+
+from skills_dashboard.aggregates import employee_summary
+from skills_dashboard.task_detail import TaskTable
+
+
+def daily_points(data, employee_id):
+    """Ежедневные очки сотрудника за весь период."""
+    points = data.points.employee(employee_id)
+    summary = employee_summary(data.employee_month.employee(employee_id))
+    return points, summary
+
+
+def daily_points_window(data, employee_id, date_from, date_to):
+    """Ежедневные очки сотрудника за период [date_from, date_to] включительно."""
+    return data.points.between(employee_id, date_from, pd.Timestamp(date_to) + pd.Timedelta(days=1))
+
+
+def month_daily_points(data, employee_id, month):
+    """Ежедневные очки сотрудника за месяц."""
+    points = data.points.month(employee_id, month)
+    summary = employee_summary(data.employee_month.month(employee_id, month))
+    return points, summary
+
+
+def month_task_detail(task_store, employee_id, month):
+    """Задания сотрудника за месяц для постраничной таблицы и агрегат по изделиям для графика.
+
+    Возвращает (TaskTable, очки по изделиям по убыванию); None и пустая
+    таблица, если заданий нет.
+    """
+    detailed_data = task_store.employee_month(employee_id, month)
+    if len(detailed_data) == 0:
+        return None, detailed_data
+
+    # Агрегируем по изделиям только для графика
+    grouped_for_chart = detailed_data.groupby(['sap_id', 'sap_name']).agg({
+        'points': 'sum'
+    }).reset_index().sort_values('points', ascending=False)
+
+    return TaskTable(detailed_data), grouped_for_chart
+
+
+def monthly_average(data, employee_id):
+    """Средние очки сотрудника по месяцам (только месяцы с ежедневными очками)."""
+    months = data.employee_month.employee(employee_id)
+    return months[months['days'] > 0], employee_summary(months)
+
+
+def skills(data, employee_id):
+    """Skills Mark сотрудника по месяцам."""
+    months = data.employee_month.employee(employee_id)
+    return months[months['skills_mark'].notna()], employee_summary(months)
+
+
+def compare_employees(matrix, employee_ids, mode, window=7):
+    """Ряды нескольких сотрудников из матрицы PointsMatrix.
+
+    mode - 'rolling' (скользящее среднее за window дней) или 'cumulative'
+    (накопленная сумма). Возвращает (id сотрудников, матрица [сотрудник, день]).
+    """
+    if mode == 'cumulative':
+        return matrix.cumulative(employee_ids)
+    return matrix.rolling_mean(employee_ids, window)